@@ -0,0 +1,89 @@
+import os
+import random
+
+from cards import cards_to_str
+from equity import adaptive_equity, exact_equity
+from preflop import preflop_equity
+
+# Pluggable equity backends for TexasHoldemGame.calculate_hand_strength.
+# Each backend answers equity(hole_cards, board, rng) against one random
+# hand, with cards as ints (see cards.py). Nothing heavy is imported until the
+# first call to get_backend(), so tools that never ask for equity (and
+# worker processes that only replay or merge) start quickly.
+#
+#   holdem_calc  the external holdem_calc package: Monte Carlo pre-flop,
+#                exhaustive once a board is down (minutes per flop spot)
+#   native       the bitmask evaluator: exact on the turn and river,
+#                adaptive sampling before that
+#   table        the precomputed pre-flop table, native after the flop
+#
+# The backend is picked by name, then by $HOLDEM_EQUITY_BACKEND, and
+# otherwise holdem_calc when it is installed and native when it is not.
+
+ENV_VAR = 'HOLDEM_EQUITY_BACKEND'
+
+
+class HoldemCalcBackend:
+    name = 'holdem_calc'
+
+    def __init__(self):
+        from holdem_calc import holdem_calc
+        self.calculate = holdem_calc.calculate
+
+    def equity(self, hole_cards, board, rng=None):
+        # holdem_calc samples from its own global random; rng cannot steer it.
+        # Against an unknown hand it plays every one of the ~1000 opponent
+        # holdings, and with a board given it ignores the sample count and
+        # enumerates every runout for each, about a million evaluations in
+        # pure Python on the flop. Nothing it accepts bounds that, so bulk
+        # work (warming a store, simulations) should use native.
+        board = cards_to_str(board) if len(board) else None
+        probability = list(self.calculate(board, False, 1, None, cards_to_str(hole_cards) + ['?', '?'], False))
+        return probability[1] + probability[0] / 2  # [tie, win, loss]: ties split the pot
+
+
+class NativeBackend:
+    name = 'native'
+
+    def __init__(self, precision=0.01):
+        self.precision = precision
+
+    def equity(self, hole_cards, board, rng=random):
+        if len(board) >= 4:
+            return exact_equity(hole_cards, board)
+        return adaptive_equity(hole_cards, board, 1, precision=self.precision, max_samples=8192, rng=rng)[0]
+
+
+class TableBackend(NativeBackend):
+    name = 'table'
+
+    def equity(self, hole_cards, board, rng=random):
+        if not len(board):
+            strength = preflop_equity(hole_cards, 1)
+            if strength is not None:
+                return strength
+        return super().equity(hole_cards, board, rng)
+
+
+BACKENDS = {backend.name: backend for backend in (HoldemCalcBackend, NativeBackend, TableBackend)}
+
+_backends = {}
+
+
+def get_backend(name=None):
+    # Instantiate (and import) a backend on first use; later calls reuse it
+    name = name or os.environ.get(ENV_VAR)
+    backend = _backends.get(name)
+    if backend is not None:
+        return backend
+    if name is None:
+        try:
+            backend = HoldemCalcBackend()
+        except ImportError:
+            backend = NativeBackend()
+    elif name in BACKENDS:
+        backend = BACKENDS[name]()
+    else:
+        raise ValueError(f'unknown equity backend {name!r}; choose from {", ".join(BACKENDS)}')
+    _backends[name] = backend
+    return backend
@@ -0,0 +1,219 @@
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+
+from lockstep import play_lockstep
+from main import TexasHoldemGame
+from state import GameState, shuffle_deck
+
+# Micro-benchmarks for the game's hot paths:
+#   python bench.py --json results.json
+#   python bench.py --compare results.json   # exit 1 on regressions
+#   python bench.py --only startup           # import time of the entry points
+# Each benchmark times one call per iteration (setup excluded) and reports
+# ops/sec plus latency percentiles in microseconds.
+
+STREETS = {'pre-flop': 0, 'flop': 3, 'turn': 4, 'river': 5}
+
+
+def summarize(times_ns):
+    times_ns = sorted(times_ns)
+    count = len(times_ns)
+
+    def percentile(p):
+        return times_ns[min(count - 1, int(p / 100 * count))] / 1000
+
+    return {
+        'iterations': count,
+        'ops_per_sec': count / (sum(times_ns) / 1e9),
+        'mean_us': sum(times_ns) / count / 1000,
+        'p50_us': percentile(50),
+        'p90_us': percentile(90),
+        'p99_us': percentile(99),
+        'max_us': times_ns[-1] / 1000,
+    }
+
+
+def measure(run, setup, iterations, warmup=10):
+    timer = time.perf_counter_ns
+    for _ in range(warmup):
+        run(setup())
+    times = []
+    for _ in range(iterations):
+        arg = setup()
+        start = timer()
+        run(arg)
+        times.append(timer() - start)
+    return summarize(times)
+
+
+def dealt_game(num_players=5, board_cards=5):
+    game = TexasHoldemGame(num_bots=num_players - 1, headless=True)
+    game.reset_game()
+    game.deal_hole_cards()
+    if board_cards:
+        game.deal_community_cards(board_cards)
+    return game
+
+
+def bench_hand_strength(street, iterations):
+    game = dealt_game(board_cards=0)
+
+    def setup():
+        # Fresh deal and an empty cache so every call is a cold lookup
+        game.reset_game()
+        game.deal_hole_cards()
+        if STREETS[street]:
+            game.deal_community_cards(STREETS[street])
+        game.equity_cache.clear()
+        return game
+
+    return measure(lambda g: g.get_hand_strength(1), setup, iterations)
+
+
+def bench_hand_rank(method, iterations):
+    game = dealt_game(num_players=2)
+
+    def setup():
+        game.reset_game()
+        game.deal_hole_cards()
+        game.deal_community_cards(5)
+        return game
+
+    return measure(lambda g: getattr(g, method)(0), setup, iterations)
+
+
+def bench_showdown(num_players, iterations):
+    game = dealt_game(num_players)
+
+    def setup():
+        game.reset_game()
+        game.deal_hole_cards()
+        game.deal_community_cards(5)
+        game.pot = 1000
+        return game
+
+    return measure(lambda g: g.showdown(), setup, iterations)
+
+
+def bench_deck(iterations):
+    # The in-place shuffle GameState.new_hand runs on its deck buffer every hand
+    deck = GameState(5, 10000).deck
+    return measure(lambda d: shuffle_deck(d, random), lambda: deck, iterations)
+
+
+def bench_reset(iterations):
+    game = dealt_game()
+    return measure(lambda g: g.reset_game(), lambda: game, iterations)
+
+
+def bench_play_hand(iterations):
+    game = TexasHoldemGame(num_bots=4, headless=True)
+
+    def setup():
+        for seat in range(game.num_players):
+            game.chips[seat] = game.starting_chips
+        return game
+
+    return measure(lambda g: g.play_hand(), setup, iterations, warmup=2)
+
+
+def bench_startup(module, iterations):
+    # Wall time of a fresh interpreter importing `module` ('' = bare interpreter)
+    command = [sys.executable, '-c', f'import {module}' if module else 'pass']
+    cwd = os.path.dirname(os.path.abspath(__file__))  # Import the repo's modules wherever bench runs from
+    return measure(lambda _: subprocess.run(command, check=True, cwd=cwd), lambda: None, iterations, warmup=2)
+
+
+def bench_lockstep(tables, iterations):
+    # One iteration plays one hand on each of `tables` tables, batch-stepped
+    games = [TexasHoldemGame(num_bots=4, headless=True) for _ in range(tables)]
+
+    def reset_stacks(game):
+        for seat in range(game.num_players):
+            game.chips[seat] = game.starting_chips
+
+    return measure(lambda g: play_lockstep(g, tables, before_hand=reset_stacks), lambda: games, iterations,
+                   warmup=1)
+
+
+def benchmarks(scale):
+    # name -> (function, iterations at scale 1)
+    suite = {}
+    for street in STREETS:
+        suite[f'get_hand_strength[{street}]'] = (lambda n, s=street: bench_hand_strength(s, n), 200)
+    suite['get_hand_rank'] = (lambda n: bench_hand_rank('get_hand_rank', n), 20000)
+    suite['get_kickers'] = (lambda n: bench_hand_rank('get_kickers', n), 20000)
+    for players in range(2, 11):
+        suite[f'showdown[{players}]'] = (lambda n, p=players: bench_showdown(p, n), 2000)
+    suite['shuffle_deck'] = (bench_deck, 20000)
+    suite['reset_game'] = (bench_reset, 20000)
+    suite['play_hand[headless,5]'] = (bench_play_hand, 50)
+    suite['lockstep[16 tables]'] = (lambda n: bench_lockstep(16, n), 5)
+    for module in ('', 'main', 'simulate', 'history', 'server'):
+        suite[f'startup[{module or "python"}]'] = (lambda n, m=module: bench_startup(m, n), 20)
+    return {name: (run, max(1, int(iterations * scale))) for name, (run, iterations) in suite.items()}
+
+
+def compare(results, baseline, tolerance):
+    # Names of benchmarks that got more than `tolerance` slower than baseline.
+    # Median latency is compared since the mean is skewed by GC/scheduler spikes.
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get('results', {}).get(name)
+        if before is None:
+            continue
+        ratio = before['p50_us'] / result['p50_us']
+        flag = ''
+        if ratio < 1 - tolerance:
+            regressions.append(name)
+            flag = '  REGRESSION'
+        print(f'{name:<28} {ratio:>7.2f}x{flag}')
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the game hot paths')
+    parser.add_argument('--scale', type=float, default=1.0, help='multiply every iteration count')
+    parser.add_argument('--only', nargs='+', metavar='PREFIX', help='run benchmarks whose name starts with PREFIX')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', metavar='PATH', help='write results as JSON (- for stdout)')
+    parser.add_argument('--compare', metavar='PATH', help='baseline JSON to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.1, help='allowed slowdown before failing')
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    results = {}
+    for name, (run, iterations) in benchmarks(args.scale).items():
+        if args.only and not any(name.startswith(prefix) for prefix in args.only):
+            continue
+        results[name] = result = run(iterations)
+        if args.json != '-':
+            print(f"{name:<28} {result['ops_per_sec']:>12.1f} ops/s  p50 {result['p50_us']:>10.1f}us  "
+                  f"p90 {result['p90_us']:>10.1f}us  p99 {result['p99_us']:>10.1f}us")
+
+    report = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': args.seed,
+        'results': results,
+    }
+    if args.json == '-':
+        json.dump(report, sys.stdout, indent=2)
+    elif args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
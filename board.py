@@ -0,0 +1,30 @@
+from cards import CARD_MASKS
+
+# Board-only facts, worked out once per street and shared by every seat.
+# TexasHoldemGame rebuilds one BoardInfo whenever community cards are dealt
+# and hands it to the equity functions, so each per-seat call starts from the
+# board mask and remaining deck instead of re-deriving them.
+
+
+class BoardInfo:
+    __slots__ = ('cards', 'mask', 'deck')
+
+    def __init__(self, board):
+        self.cards = bytes(board)
+        mask = 0
+        for card in board:
+            mask |= CARD_MASKS[card]
+        self.mask = mask
+        self.deck = [card for card in range(52) if not mask & CARD_MASKS[card]]  # Cards not on the board
+
+    def __len__(self):
+        return len(self.cards)
+
+    def live_cards(self, dead_mask):
+        # Remaining deck minus the given cards (e.g. the hole cards in play)
+        return [card for card in self.deck if not dead_mask & CARD_MASKS[card]]
+
+
+def board_info(board):
+    # Accept either raw board cards or an already built BoardInfo
+    return board if isinstance(board, BoardInfo) else BoardInfo(board)
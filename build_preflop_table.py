@@ -0,0 +1,64 @@
+import argparse
+import random
+
+from cards import evaluate
+from preflop import HEADER, ENTRY, MAGIC, MAX_OPPONENTS, NUM_CLASSES, TABLE_PATH, class_name
+
+# Build-time generator for preflop_equity.bin:
+#   python build_preflop_table.py --samples 20000 --seed 1
+# Cards use the integer encoding from cards.py.
+
+
+def representative_hand(index):
+    # Concrete hole cards for a hand class (ranks in the table are ace-high first)
+    row, col = divmod(index, 13)
+    high, low = 12 - min(row, col), 12 - max(row, col)
+    if row < col:
+        return [high * 4, low * 4]  # Suited
+    return [high * 4, low * 4 + 1]  # Pair or offsuit
+
+
+def class_equities(hole, samples, rng):
+    # One sample deals a full 9-opponent table; the first k opponents give the
+    # result against k players, so every opponent count shares the runouts
+    deck = [card for card in range(52) if card not in hole]
+    totals = [0.0] * MAX_OPPONENTS
+    for _ in range(samples):
+        dealt = rng.sample(deck, 5 + 2 * MAX_OPPONENTS)
+        board = dealt[:5]
+        hero = evaluate(hole + board)
+        best = None
+        ties = 0
+        for k in range(MAX_OPPONENTS):
+            villain = evaluate(dealt[5 + 2 * k:7 + 2 * k] + board)
+            if best is None or villain > best:
+                best, ties = villain, 1
+            elif villain == best:
+                ties += 1
+            if hero > best:
+                totals[k] += 1.0
+            elif hero == best:
+                totals[k] += 1.0 / (ties + 1)
+    return [total / samples for total in totals]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate the pre-flop equity table')
+    parser.add_argument('--samples', type=int, default=20000)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', default=TABLE_PATH)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    data = bytearray(HEADER.pack(MAGIC, NUM_CLASSES, MAX_OPPONENTS))
+    for index in range(NUM_CLASSES):
+        equities = class_equities(representative_hand(index), args.samples, rng)
+        for equity in equities:
+            data += ENTRY.pack(equity)
+        print(f'{class_name(index):>4}: ' + ' '.join(f'{e:.3f}' for e in equities))
+    with open(args.output, 'wb') as f:
+        f.write(data)
+
+
+if __name__ == '__main__':
+    main()
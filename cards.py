@@ -0,0 +1,149 @@
+# Integer card representation and bitmask hand evaluator.
+#
+# A card is an int in 0-51: rank * 4 + suit, with rank 0 = deuce ... 12 = ace.
+# A hand mask packs cards into four 16-bit suit blocks (bit suit * 16 + rank),
+# so per-suit rank sets fall out of shifts and pair/trip/quad detection is a
+# handful of bitwise ops instead of string parsing and counting.
+
+RANKS = '23456789TJQKA'
+SUITS = 'shdc'
+
+HAND_NAMES = ['High Card', 'One Pair', 'Two Pair', 'Three of a Kind',
+              'Straight', 'Flush', 'Full House', 'Four of a Kind', 'Straight Flush']
+
+# Hand values are category << 20 followed by up to five 4-bit ranks
+CATEGORY_SHIFT = 20
+HIGH_CARD, ONE_PAIR, TWO_PAIR, THREE_OF_A_KIND, STRAIGHT, FLUSH, FULL_HOUSE, FOUR_OF_A_KIND, STRAIGHT_FLUSH = (
+    category << CATEGORY_SHIFT for category in range(9))
+
+CARD_MASKS = [1 << ((card & 3) * 16 + (card >> 2)) for card in range(52)]
+FULL_DECK_MASK = sum(CARD_MASKS)
+# Five-rank windows, ace-high down to the wheel (A-2-3-4-5)
+STRAIGHT_WINDOWS = [0x1f << low for low in range(8, -1, -1)] + [0x100f]
+
+
+def card_from_str(text):
+    return RANKS.index(text[0]) * 4 + SUITS.index(text[1])
+
+
+def card_to_str(card):
+    return RANKS[card >> 2] + SUITS[card & 3]
+
+
+def cards_from_str(texts):
+    return [card_from_str(text) for text in texts]
+
+
+def cards_to_str(cards):
+    return [card_to_str(card) for card in cards]
+
+
+def create_deck():
+    return list(range(52))
+
+
+def hand_mask(cards):
+    mask = 0
+    for card in cards:
+        mask |= CARD_MASKS[card]
+    return mask
+
+
+def mask_cards(mask):
+    return [card for card in range(52) if mask & CARD_MASKS[card]]
+
+
+def _build_tables():
+    # Every table is filled from smaller masks already done, so building
+    # them on import stays in the low milliseconds
+    masks = range(1, 8192)
+    popcount = [0] + [bin(mask).count('1') for mask in masks]
+    high_bit = [0] + [mask.bit_length() - 1 for mask in masks]
+    rest = [0] + [mask ^ (1 << high_bit[mask]) for mask in masks]  # Mask minus its top rank
+    straight_high = [0] * 8192
+    kickers = [[0] * 8192]  # kickers[n]: top n ranks packed 4 bits each
+    for n in range(1, 6):
+        shift = 4 * (n - 1)
+        fewer = kickers[-1]
+        kickers.append([0] + [high_bit[mask] << shift | fewer[rest[mask]] for mask in masks])
+    # Wheel first, then each higher straight overwrites the masks that contain it
+    windows = [(0x100f, 3)] + [(0x1f << (high - 4), high) for high in range(4, 13)]
+    for window, high in windows:
+        free = 0x1fff ^ window
+        subset = free
+        while True:  # Every mask that contains the window
+            straight_high[window | subset] = high
+            if not subset:
+                break
+            subset = (subset - 1) & free
+    return popcount, high_bit, straight_high, kickers[1], kickers[2], kickers[3], kickers[5]
+
+
+POPCOUNT, HIGH_BIT, STRAIGHT_HIGH, KICKERS1, KICKERS2, KICKERS3, KICKERS5 = _build_tables()
+
+
+def evaluate_mask(mask):
+    # Return one comparable int for the best 5-card hand in a 5-7 card mask
+    s0 = mask & 0x1fff
+    s1 = mask >> 16 & 0x1fff
+    s2 = mask >> 32 & 0x1fff
+    s3 = mask >> 48 & 0x1fff
+
+    flush = 0
+    for suited in (s0, s1, s2, s3):
+        if POPCOUNT[suited] >= 5:
+            high = STRAIGHT_HIGH[suited]
+            if high:
+                return STRAIGHT_FLUSH | high << 16
+            flush = FLUSH | KICKERS5[suited]
+            break
+
+    ranks = s0 | s1 | s2 | s3
+    quads = s0 & s1 & s2 & s3
+    if quads:
+        quad = HIGH_BIT[quads]
+        return FOUR_OF_A_KIND | quad << 16 | HIGH_BIT[ranks ^ (1 << quad)] << 12
+
+    # Ranks held three times, and ranks held exactly twice
+    threes = ((s0 & s1) | (s2 & s3)) & ((s0 & s2) | (s1 & s3))
+    twos = ranks & ~(s0 ^ s1 ^ s2 ^ s3)
+    if threes:
+        trips = HIGH_BIT[threes]
+        rest = (threes | twos) ^ (1 << trips)
+        if rest:
+            return FULL_HOUSE | trips << 16 | HIGH_BIT[rest] << 12
+    if flush:
+        return flush
+    high = STRAIGHT_HIGH[ranks]
+    if high:
+        return STRAIGHT | high << 16
+    if threes:
+        return THREE_OF_A_KIND | trips << 16 | KICKERS2[ranks ^ (1 << trips)] << 8
+    if twos:
+        top = HIGH_BIT[twos]
+        rest = twos ^ (1 << top)
+        if rest:
+            second = HIGH_BIT[rest]
+            kicker = HIGH_BIT[ranks ^ (1 << top) ^ (1 << second)]
+            return TWO_PAIR | top << 16 | second << 12 | kicker << 8
+        return ONE_PAIR | top << 16 | KICKERS3[ranks ^ (1 << top)] << 4
+    return HIGH_CARD | KICKERS5[ranks]
+
+
+def evaluate(cards):
+    mask = 0
+    for card in cards:
+        mask |= CARD_MASKS[card]
+    return evaluate_mask(mask)
+
+
+def hand_category(value):
+    return value >> CATEGORY_SHIFT
+
+
+def hand_ranks(value):
+    # The ranks (2-14) encoded in a hand value, most significant first
+    category = value >> CATEGORY_SHIFT
+    count = {HIGH_CARD: 5, ONE_PAIR: 4, TWO_PAIR: 3, THREE_OF_A_KIND: 3, STRAIGHT: 1,
+             FLUSH: 5, FULL_HOUSE: 2, FOUR_OF_A_KIND: 2, STRAIGHT_FLUSH: 1}[category << CATEGORY_SHIFT]
+    return [(value >> (16 - 4 * i) & 0xf) + 2 for i in range(count)]
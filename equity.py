@@ -0,0 +1,230 @@
+import random
+from bisect import bisect
+from itertools import accumulate, combinations
+from math import comb, sqrt
+
+from board import board_info
+from cards import CARD_MASKS, POPCOUNT, evaluate_mask, hand_mask
+from ranges import COMBO_COUNT, COMBO_MASKS
+
+# Equity estimators built on the bitmask evaluator in cards.py. `board` is
+# either a list of cards or the street's shared BoardInfo (see board.py).
+
+
+def batch_equity(hands, board, samples=1000, rng=random):
+    # Showdown equity of every hand at once. Each runout is dealt a single
+    # time and scored for all seats, instead of one simulation per seat.
+    # When the runouts fit in the sample budget (flop, turn, river) they are
+    # enumerated, which is both exact and cheaper than sampling.
+    board = board_info(board)
+    hole_masks = [hand_mask(hand) for hand in hands]
+    board_mask = board.mask
+    dead = 0
+    for mask in hole_masks:
+        dead |= mask
+    deck = board.live_cards(dead)
+    missing = 5 - len(board)
+
+    if comb(len(deck), missing) <= samples:
+        runouts = combinations(deck, missing)
+    else:
+        runouts = (rng.sample(deck, missing) for _ in range(samples))
+
+    totals = [0.0] * len(hands)
+    count = 0
+    seats = range(len(hands))
+    for runout in runouts:
+        mask = board_mask
+        for card in runout:
+            mask |= CARD_MASKS[card]
+        values = [evaluate_mask(mask | hole) for hole in hole_masks]
+        best = max(values)
+        winners = [seat for seat in seats if values[seat] == best]
+        share = 1.0 / len(winners)
+        for seat in winners:
+            totals[seat] += share
+        count += 1
+    return [total / count for total in totals]
+
+
+def wilson_interval(p, n, z=1.96):
+    # Wilson score interval for a proportion p observed over n samples
+    z2 = z * z
+    denom = 1 + z2 / n
+    centre = (p + z2 / (2 * n)) / denom
+    half = z * sqrt(p * (1 - p) / n + z2 / (4 * n * n)) / denom
+    return centre - half, centre + half
+
+
+def adaptive_equity(hole_cards, board, opponents=1, thresholds=(), precision=0.02,
+                    batch=64, min_samples=128, max_samples=2048, z=1.96, rng=random):
+    # Equity against random opponent hands, sampled in batches until the
+    # Wilson interval clears every decision threshold or is within
+    # +/- precision. Returns (equity, samples used).
+    board = board_info(board)
+    hole_mask = hand_mask(hole_cards)
+    board_mask = board.mask
+    deck = board.live_cards(hole_mask)
+    missing = 5 - len(board)
+    deal = missing + 2 * opponents
+
+    # Partial Fisher-Yates over one reused deck list: the first `deal`
+    # cards after each pass are a uniform sample, with no per-sample copies
+    size = len(deck)
+    uniform = rng.random
+    total = 0.0
+    samples = 0
+    while samples < max_samples:
+        for _ in range(batch):
+            for i in range(deal):
+                j = i + int(uniform() * (size - i))
+                deck[i], deck[j] = deck[j], deck[i]
+            mask = board_mask
+            for i in range(missing):
+                mask |= CARD_MASKS[deck[i]]
+            hero = evaluate_mask(mask | hole_mask)
+            ties = 0
+            for i in range(missing, deal, 2):
+                villain = evaluate_mask(mask | CARD_MASKS[deck[i]] | CARD_MASKS[deck[i + 1]])
+                if villain > hero:
+                    break
+                if villain == hero:
+                    ties += 1
+            else:
+                total += 1.0 / (ties + 1)
+        samples += batch
+        if samples < min_samples:
+            continue
+        low, high = wilson_interval(total / samples, samples, z)
+        if high - low <= 2 * precision or (thresholds and not any(low <= t <= high for t in thresholds)):
+            break
+    return total / samples, samples
+
+
+def range_equity(hole_cards, board, ranges, thresholds=(), precision=0.02,
+                 batch=64, min_samples=128, max_samples=2048, z=1.96, rng=random):
+    # Equity against every opponent's weighted range (see ranges.py), with
+    # the same stopping rule as adaptive_equity
+    total, samples = range_tally(hole_cards, board, ranges, thresholds, precision, batch, min_samples,
+                                 max_samples, z, rng)
+    return total / samples, samples
+
+
+def settled(total, samples, thresholds, precision, min_samples, max_samples, z):
+    # Stopping rule of range_tally: enough samples, and either precise enough
+    # or clear of every threshold
+    if samples >= max_samples:
+        return True
+    if samples < min_samples:
+        return False
+    low, high = wilson_interval(total / samples, samples, z)
+    return high - low <= 2 * precision or bool(thresholds and not any(low <= t <= high for t in thresholds))
+
+
+def range_tally(hole_cards, board, ranges, thresholds=(), precision=0.02, batch=64,
+                min_samples=128, max_samples=2048, z=1.96, rng=random, total=0.0, samples=0):
+    # range_equity's running (total, samples), carried on from a tally an
+    # earlier call returned for the same spot and ranges, so cached estimates
+    # only ever get sharper (see EquityCache.range_lookup). Each opponent's
+    # combo is drawn in proportion to its weight; a deal where two hands share
+    # a card is redrawn whole, which samples the joint distribution exactly.
+    if settled(total, samples, thresholds, precision, min_samples, max_samples, z):
+        return total, samples
+    board = board_info(board)
+    hole_mask = hand_mask(hole_cards)
+    board_mask = board.mask
+    dead = hole_mask | board_mask
+    samplers = []
+    live = [i for i in range(COMBO_COUNT) if not dead & COMBO_MASKS[i]]
+    live_masks = [COMBO_MASKS[i] for i in live]
+    for weights in ranges:
+        # Zero-weight combos add nothing to the running sum, so bisect never picks them
+        cumulative = list(accumulate([weights[i] for i in live]))
+        if cumulative[-1] > 0:
+            samplers.append((live_masks, cumulative, cumulative[-1]))
+    deck = [CARD_MASKS[card] for card in board.live_cards(hole_mask)]
+    size = len(deck)
+    missing = 5 - len(board)
+
+    uniform = rng.random
+    while not settled(total, samples, thresholds, precision, min_samples, max_samples, z):
+        dealt = 0
+        while dealt < batch:
+            used = dead
+            villains = []
+            for combos, cumulative, weight in samplers:
+                combo = combos[bisect(cumulative, uniform() * weight)]
+                if used & combo:
+                    break
+                used |= combo
+                villains.append(combo)
+            else:
+                mask = board_mask
+                for _ in range(missing):
+                    card = deck[int(uniform() * size)]
+                    while used & card:
+                        card = deck[int(uniform() * size)]
+                    used |= card
+                    mask |= card
+                hero = evaluate_mask(mask | hole_mask)
+                ties = 0
+                for villain in villains:
+                    value = evaluate_mask(mask | villain)
+                    if value > hero:
+                        break
+                    if value == hero:
+                        ties += 1
+                else:
+                    total += 1.0 / (ties + 1)
+                dealt += 1
+        samples += batch
+    return total, samples
+
+
+def exact_equity(hole_cards, board):
+    # Exact equity against one random hand on the turn or river. Villain
+    # combos are walked in lexicographic order so each villain's six known
+    # cards (board + hole) are combined once and reused for every river. A
+    # river outside any suit the villain holds four of cannot make a flush,
+    # so its value depends only on its rank: those are evaluated once per
+    # rank per villain, which more than halves the time of a turn enumeration.
+    board = board_info(board)
+    hole_mask = hand_mask(hole_cards)
+    board_mask = board.mask
+    live = board.live_cards(hole_mask)
+    masks = [CARD_MASKS[card] for card in live]
+    size = len(masks)
+
+    if len(board) == 5:
+        rivers = [(0, evaluate_mask(board_mask | hole_mask), 0, 0)]
+    else:
+        rivers = [(mask, evaluate_mask(board_mask | hole_mask | mask), card >> 2, 0x1fff << 16 * (card & 3))
+                  for mask, card in zip(masks, live)]
+
+    total = 0.0
+    count = 0
+    for i in range(size):
+        first = board_mask | masks[i]
+        for j in range(i + 1, size):
+            partial = first | masks[j]
+            # Suits in which one more card could complete the villain's flush
+            flushing = 0
+            for suit in (0, 16, 32, 48):
+                if POPCOUNT[partial >> suit & 0x1fff] >= 4:
+                    flushing |= 0x1fff << suit
+            by_rank = [0] * 13
+            for river, hero, rank, suit in rivers:
+                if partial & river:
+                    continue  # River card is in the villain's hand
+                if suit & flushing:
+                    villain = evaluate_mask(partial | river)
+                else:
+                    villain = by_rank[rank]
+                    if not villain:
+                        villain = by_rank[rank] = evaluate_mask(partial | river)
+                if hero > villain:
+                    total += 1.0
+                elif hero == villain:
+                    total += 0.5
+                count += 1
+    return total / count
@@ -0,0 +1,161 @@
+from collections import OrderedDict
+
+
+def suit_relabel(hole_cards, board):
+    # Suit renaming that maps isomorphic spots (same ranks, suits permuted)
+    # onto one canonical spot. Each suit gets a signature of the ranks it
+    # holds in the hole and on the board; suits are renamed in signature
+    # order. Suits with identical signatures are interchangeable, so ties
+    # are safe. relabel[suit] is the suit's canonical name.
+    hole_cards = sorted(hole_cards)
+    board = sorted(board or [])
+    signatures = sorted(
+        (tuple(card >> 2 for card in hole_cards if card & 3 == suit),
+         tuple(card >> 2 for card in board if card & 3 == suit),
+         suit)
+        for suit in range(4)
+    )
+    relabel = [0] * 4
+    for i, signature in enumerate(signatures):
+        relabel[signature[2]] = i
+    return relabel
+
+
+def relabel_cards(cards, relabel):
+    return tuple(sorted(card & ~3 | relabel[card & 3] for card in cards))
+
+
+def canonical_key(hole_cards, board, opponents, method):
+    # method names what produced the value (a backend name, or 'exact'), so
+    # estimates from different backends never answer for each other
+    relabel = suit_relabel(hole_cards, board)
+    return relabel_cards(hole_cards, relabel), relabel_cards(board or (), relabel), opponents, method
+
+
+def range_key(hole_cards, board, histories):
+    # Key of a range-equity spot. Opponents' ranges depend on the board each
+    # narrowing saw, so the board keeps its street order (sorted flop, then
+    # turn, then river), and each opponent adds their narrowing history (see
+    # ranges.Range.history); the order of the opponents does not matter.
+    relabel = suit_relabel(hole_cards, board)
+    board = tuple(board or ())
+    streets = relabel_cards(board[:3], relabel) + relabel_cards(board[3:4], relabel) + relabel_cards(board[4:], relabel)
+    return relabel_cards(hole_cards, relabel), streets, tuple(sorted(histories))
+
+
+class EquityCache:
+    # Bounded LRU cache of equity results keyed by canonical_key(), one of
+    # range-equity tallies keyed by range_key(), and a smaller one of
+    # per-board combo strength tables (see ranges.combo_strengths)
+    def __init__(self, maxsize=65536, board_maxsize=512):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.board_maxsize = board_maxsize
+        self.boards = OrderedDict()  # Canonical board tuple -> strength table
+        self.board_hits = 0
+        self.board_misses = 0
+        self.tallies = OrderedDict()  # range_key() -> (total, samples)
+        self.range_hits = 0
+        self.range_misses = 0
+
+    def get(self, key):
+        try:
+            value = self.entries[key]
+        except KeyError:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def lookup(self, hole_cards, board, opponents, method, compute):
+        # Return the cached equity for this spot, computing it on a miss
+        key = canonical_key(hole_cards, board, opponents, method)
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def board_lookup(self, board, compute):
+        # Return the strength table of a canonical board, computing it on a miss
+        table = self.boards.get(board)
+        if table is not None:
+            self.boards.move_to_end(board)
+            self.board_hits += 1
+            return table
+        self.board_misses += 1
+        table = self.boards[board] = self.compute_board(board, compute)
+        if len(self.boards) > self.board_maxsize:
+            self.boards.popitem(last=False)
+        return table
+
+    def compute_board(self, board, compute):
+        # Fill a board_lookup miss; PersistentEquityCache looks in its store first
+        return compute()
+
+    def range_lookup(self, hole_cards, board, histories, extend):
+        # Range-equity tally for this spot. extend(total, samples) carries the
+        # stored tally (or an empty one) on until it answers the caller's
+        # question; the longer tally is kept, so estimates only get sharper.
+        key = range_key(hole_cards, board, histories)
+        tally = self.get_tally(key)
+        extended = extend(*(tally or (0.0, 0)))
+        if tally is None or extended[1] > tally[1]:
+            self.put_tally(key, extended)
+        return extended
+
+    def get_tally(self, key):
+        tally = self.tallies.get(key)
+        if tally is None:
+            self.range_misses += 1
+            return self.fetch_tally(key)
+        self.tallies.move_to_end(key)
+        self.range_hits += 1
+        return tally
+
+    def fetch_tally(self, key):
+        # Fill a get_tally miss; PersistentEquityCache looks in its store
+        return None
+
+    def put_tally(self, key, tally):
+        self.tallies[key] = tally
+        self.tallies.move_to_end(key)
+        if len(self.tallies) > self.maxsize:
+            self.tallies.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+        self.boards.clear()
+        self.tallies.clear()
+        self.hits = self.misses = self.evictions = 0
+        self.board_hits = self.board_misses = 0
+        self.range_hits = self.range_misses = 0
+
+    def stats(self):
+        return {
+            'size': len(self.entries),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'board_size': len(self.boards),
+            'board_hits': self.board_hits,
+            'board_misses': self.board_misses,
+            'range_size': len(self.tallies),
+            'range_hits': self.range_hits,
+            'range_misses': self.range_misses,
+        }
+
+    def __len__(self):
+        return len(self.entries)
@@ -0,0 +1,222 @@
+import argparse
+import random
+from array import array
+from collections import Counter
+import sqlite3
+import sys
+
+from cards import cards_to_str
+from equity_cache import EquityCache, canonical_key
+
+# On-disk equity results shared between processes and runs. Entries live in
+# an SQLite file in WAL mode, so any number of simulation workers can read
+# while one writes. Each process keeps an EquityCache in front of the file as
+# its working set and queues new results, writing them in batches. Besides
+# single-spot equities the store keeps per-board combo strength tables, which
+# range narrowing needs whenever a bet is called or raised after the flop
+# (see ranges.combo_strengths), so a restarted server keeps the boards it has
+# already worked out, and range-equity tallies (see EquityCache.range_lookup),
+# which bots consult on every decision.
+#
+#   python equity_store.py warm equity.db --spots 100000 --street flop
+#   python equity_store.py export equity.db > equity.csv
+#   python equity_store.py stats equity.db
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS equity (spot BLOB PRIMARY KEY, equity REAL NOT NULL) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS strengths (board BLOB PRIMARY KEY, ranks BLOB NOT NULL);
+CREATE TABLE IF NOT EXISTS range_equity (spot BLOB PRIMARY KEY, total REAL NOT NULL,
+                                         samples INTEGER NOT NULL) WITHOUT ROWID;
+'''
+BOARD_SIZES = {'pre-flop': 0, 'flop': 3, 'turn': 4, 'river': 5}
+
+
+def encode_key(key):
+    # canonical_key() tuple -> compact blob: method, NUL, hole cards, board cards, opponents
+    hole, board, opponents, method = key
+    return method.encode() + b'\0' + bytes(hole) + bytes(board) + bytes([opponents])
+
+
+def decode_key(blob):
+    method, _, spot = blob.partition(b'\0')
+    return tuple(spot[:2]), tuple(spot[2:-1]), spot[-1], method.decode()
+
+
+def encode_range_key(key):
+    # range_key() tuple -> blob: hole cards, board size, board cards, then each
+    # opponent's history behind its length. The board size comes third so the
+    # street can be read back without decoding the rest.
+    hole, board, histories = key
+    return bytes(hole) + bytes([len(board)]) + bytes(board) + b''.join(bytes([len(h)]) + h for h in histories)
+
+
+def encode_strengths(table):
+    # Percentiles are rank / (n - 1) (see ranges.percentiles), so the ranks
+    # fit in 16 bits each and decode to the identical floats
+    scale = len(table) - 1
+    return array('H', [round(strength * scale) for strength in table]).tobytes()
+
+
+def decode_strengths(blob):
+    ranks = array('H')
+    ranks.frombytes(blob)
+    scale = 1 / max(1, len(ranks) - 1)
+    return array('d', [rank * scale for rank in ranks])
+
+
+def connect(path, timeout=30.0):
+    db = sqlite3.connect(path, timeout=timeout)  # Wait out other writers' batches
+    db.execute('PRAGMA journal_mode=WAL')
+    db.execute('PRAGMA synchronous=NORMAL')
+    db.executescript(SCHEMA)
+    return db
+
+
+class PersistentEquityCache(EquityCache):
+    # Drop-in EquityCache whose misses fall through to (and fill) an SQLite store
+    def __init__(self, path, maxsize=65536, batch_size=512):
+        super().__init__(maxsize)
+        self.db = connect(path)
+        self.batch_size = batch_size
+        self.pending = []
+        self.pending_boards = []
+        self.pending_tallies = []
+        self.store_hits = 0
+        self.board_store_hits = 0
+        self.range_store_hits = 0
+
+    def lookup(self, hole_cards, board, opponents, method, compute):
+        key = canonical_key(hole_cards, board, opponents, method)
+        value = self.get(key)
+        if value is not None:
+            return value
+        row = self.db.execute('SELECT equity FROM equity WHERE spot = ?', (encode_key(key),)).fetchone()
+        if row is not None:
+            self.store_hits += 1
+            value = row[0]
+        else:
+            value = compute()
+            self.pending.append((encode_key(key), value))
+            if len(self.pending) >= self.batch_size:
+                self.flush()
+        self.put(key, value)
+        return value
+
+    def compute_board(self, board, compute):
+        row = self.db.execute('SELECT ranks FROM strengths WHERE board = ?', (bytes(board),)).fetchone()
+        if row is not None:
+            self.board_store_hits += 1
+            return decode_strengths(row[0])
+        table = compute()
+        self.pending_boards.append((bytes(board), encode_strengths(table)))
+        if len(self.pending_boards) >= self.batch_size:
+            self.flush()
+        return table
+
+    def fetch_tally(self, key):
+        row = self.db.execute('SELECT total, samples FROM range_equity WHERE spot = ?',
+                              (encode_range_key(key),)).fetchone()
+        if row is not None:
+            self.range_store_hits += 1
+        return row
+
+    def put_tally(self, key, tally):
+        super().put_tally(key, tally)
+        self.pending_tallies.append((encode_range_key(key),) + tuple(tally))
+        if len(self.pending_tallies) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self.pending or self.pending_boards or self.pending_tallies:
+            with self.db:  # One transaction per batch
+                self.db.executemany('INSERT OR IGNORE INTO equity VALUES (?, ?)', self.pending)
+                self.db.executemany('INSERT OR IGNORE INTO strengths VALUES (?, ?)', self.pending_boards)
+                # Another process may have sampled the spot further meanwhile; keep the longer tally
+                self.db.executemany('INSERT INTO range_equity VALUES (?, ?, ?) ON CONFLICT (spot) DO UPDATE '
+                                    'SET total = excluded.total, samples = excluded.samples '
+                                    'WHERE excluded.samples > range_equity.samples', self.pending_tallies)
+            self.pending.clear()
+            self.pending_boards.clear()
+            self.pending_tallies.clear()
+
+    def close(self):
+        self.flush()
+        self.db.close()
+
+    def stats(self):
+        stats = super().stats()
+        stats['store_hits'] = self.store_hits
+        stats['board_store_hits'] = self.board_store_hits
+        stats['range_store_hits'] = self.range_store_hits
+        return stats
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def warm(path, spots, street, backend=None, seed=None):
+    # Fill the store with random spots on one street; returns new entries
+    from backends import get_backend
+
+    backend = get_backend(backend)
+    rng = random.Random(seed)
+    deck = list(range(52))
+    board_size = BOARD_SIZES[street]
+    with PersistentEquityCache(path) as cache:
+        before = cache.db.execute('SELECT COUNT(*) FROM equity').fetchone()[0]
+        for _ in range(spots):
+            cards = rng.sample(deck, 2 + board_size)
+            hole, board = cards[:2], cards[2:]
+            cache.lookup(hole, board, 1, backend.name, lambda: backend.equity(hole, board, rng))
+        cache.flush()
+        return cache.db.execute('SELECT COUNT(*) FROM equity').fetchone()[0] - before
+
+
+def export(path, out):
+    # CSV of every stored spot, cards written as strings
+    db = connect(path)
+    out.write('method,hole,board,opponents,equity\n')
+    for blob, value in db.execute('SELECT spot, equity FROM equity'):
+        hole, board, opponents, method = decode_key(blob)
+        out.write(f"{method},{''.join(cards_to_str(hole))},{''.join(cards_to_str(board))},{opponents},{value:.6f}\n")
+    db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Manage a persistent equity store')
+    commands = parser.add_subparsers(dest='command', required=True)
+    warm_parser = commands.add_parser('warm', help='precompute random spots')
+    warm_parser.add_argument('path')
+    warm_parser.add_argument('--spots', type=int, default=10000)
+    warm_parser.add_argument('--street', choices=list(BOARD_SIZES), default='flop')
+    warm_parser.add_argument('--backend', help='equity backend (see backends.py)')
+    warm_parser.add_argument('--seed', type=int)
+    export_parser = commands.add_parser('export', help='write every entry as CSV to stdout')
+    export_parser.add_argument('path')
+    stats_parser = commands.add_parser('stats', help='count spots, board tables and range tallies per street')
+    stats_parser.add_argument('path')
+    args = parser.parse_args()
+
+    if args.command == 'warm':
+        added = warm(args.path, args.spots, args.street, args.backend, args.seed)
+        print(f'{added} new spots')
+    elif args.command == 'export':
+        export(args.path, sys.stdout)
+    else:
+        db = connect(args.path)
+        # Board size is what follows the method name, its NUL, the hole cards and the opponents byte
+        counts = dict(db.execute("SELECT length(spot) - instr(spot, X'00') - 3 AS size, COUNT(*) "
+                                 'FROM equity GROUP BY size'))
+        boards = dict(db.execute('SELECT length(board), COUNT(*) FROM strengths GROUP BY length(board)'))
+        ranges = Counter(spot[2] for spot, in db.execute('SELECT spot FROM range_equity'))  # Board size byte
+        db.close()
+        print(f"{'street':<9} {'spots':>10} {'boards':>10} {'ranges':>10}")
+        for street, size in BOARD_SIZES.items():
+            print(f'{street:<9} {counts.get(size, 0):>10} {boards.get(size, 0):>10} {ranges.get(size, 0):>10}')
+
+
+if __name__ == '__main__':
+    main()
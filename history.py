@@ -0,0 +1,195 @@
+import argparse
+import mmap
+import struct
+from collections import namedtuple
+
+from cards import card_to_str
+
+# Binary hand-history log. The file starts with MAGIC, followed by
+# length-prefixed records: a 1-byte type and a 2-byte payload length.
+#
+#   HAND_START  hand number, seats, dealer, small blind, the 52-card deck
+#               order and every stack before the blinds
+#   ACTION      seat, street, action, amount and pot after the action
+#   HAND_END    every stack after the pot is awarded
+#
+# Writes are buffered and flushed in batches; reading walks an mmap of the
+# file and yields one hand at a time, so logs far larger than memory are fine.
+
+MAGIC = b'HHv1'
+RECORD = struct.Struct('<BH')
+HAND_START, ACTION, HAND_END = 1, 2, 3
+START = struct.Struct('<QBBq')
+ACTION_RECORD = struct.Struct('<BBBqq')
+STACK = struct.Struct('<q')
+
+STREETS = ['pre-flop', 'flop', 'turn', 'river']
+ACTIONS = ['fold', 'call', 'raise', 'small blind', 'big blind']
+
+Hand = namedtuple('Hand', 'number dealer small_blind deck chips actions final_chips')
+Action = namedtuple('Action', 'seat street action amount pot')
+
+
+class HandRecorder:
+    # Game observer that rebuilds each hand as a Hand tuple
+    def __init__(self):
+        self.hands = 0
+        self.current = None
+
+    def on_hand_start(self, game):
+        self.current = Hand(self.hands, game.current_dealer, game.small_blind, bytes(game.state.deck),
+                            tuple(game.chips), [], None)
+
+    def on_action(self, game, seat, street, action, amount):
+        self.current.actions.append(Action(seat, street, action, amount, game.pot))
+
+    def on_hand_end(self, game):
+        hand = self.current._replace(actions=tuple(self.current.actions), final_chips=tuple(game.chips))
+        self.current = None
+        self.hands += 1
+        self.handle(hand)
+
+    def handle(self, hand):
+        pass
+
+
+class TableRecorder(HandRecorder):
+    # One per table when several tables share a recorder (see lockstep.py):
+    # each tracks its own hand in progress and hands the finished hand on,
+    # renumbered in the shared recorder's sequence
+    def __init__(self, recorder):
+        super().__init__()
+        self.recorder = recorder
+
+    def handle(self, hand):
+        self.recorder.handle(hand._replace(number=self.recorder.hands))
+        self.recorder.hands += 1
+
+
+class HandHistoryWriter(HandRecorder):
+    def __init__(self, path, flush_bytes=1 << 20):
+        super().__init__()
+        self.file = open(path, 'ab')
+        self.flush_bytes = flush_bytes
+        self.buffer = bytearray()
+        if self.file.tell() == 0:
+            self.buffer += MAGIC
+
+    def handle(self, hand):
+        self.buffer += encode_hand(hand)
+        if len(self.buffer) >= self.flush_bytes:
+            self.flush()
+
+    def flush(self):
+        self.file.write(self.buffer)
+        self.file.flush()
+        self.buffer.clear()
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def encode_hand(hand):
+    start = START.pack(hand.number, len(hand.chips), hand.dealer, hand.small_blind) + hand.deck
+    start += b''.join(STACK.pack(stack) for stack in hand.chips)
+    data = bytearray(RECORD.pack(HAND_START, len(start)) + start)
+    for action in hand.actions:
+        data += RECORD.pack(ACTION, ACTION_RECORD.size)
+        data += ACTION_RECORD.pack(action.seat, STREETS.index(action.street), ACTIONS.index(action.action),
+                                   action.amount, action.pot)
+    end = b''.join(STACK.pack(stack) for stack in hand.final_chips)
+    data += RECORD.pack(HAND_END, len(end)) + end
+    return data
+
+
+def read_hands(path):
+    # Stream hands out of a log without loading it into memory
+    with open(path, 'rb') as f:
+        if f.seek(0, 2) == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            if data[:len(MAGIC)] != MAGIC:
+                raise ValueError(f'{path} is not a hand-history log')
+            pos = len(MAGIC)
+            hand = None
+            while pos < len(data):
+                kind, length = RECORD.unpack_from(data, pos)
+                pos += RECORD.size
+                if kind == HAND_START:
+                    number, seats, dealer, small_blind = START.unpack_from(data, pos)
+                    deck_start = pos + START.size
+                    deck = data[deck_start:deck_start + 52]
+                    chips = struct.unpack_from(f'<{seats}q', data, deck_start + 52)
+                    hand = Hand(number, dealer, small_blind, deck, chips, [], None)
+                elif kind == ACTION:
+                    seat, street, action, amount, pot = ACTION_RECORD.unpack_from(data, pos)
+                    hand.actions.append(Action(seat, STREETS[street], ACTIONS[action], amount, pot))
+                elif kind == HAND_END:
+                    final_chips = struct.unpack_from(f'<{length // STACK.size}q', data, pos)
+                    yield hand._replace(actions=tuple(hand.actions), final_chips=final_chips)
+                    hand = None
+                pos += length
+
+
+class ScriptedPolicy:
+    # Plays back recorded decisions for every seat
+    def __init__(self, actions):
+        self.actions = iter([a for a in actions if a.action in ('fold', 'call', 'raise')])
+
+    def __call__(self, game, seat, current_bet, to_call, round_name):
+        action = next(self.actions, None)
+        if action is None or action.seat != seat or action.street != round_name:
+            return 'fold', 0  # Off script; the replayed hand will differ
+        return action.action, action.amount
+
+
+def replay(hand):
+    # Re-run a recorded hand through the engine and return the hand it produces.
+    # A faithful engine gives back an identical Hand.
+    from main import TexasHoldemGame
+
+    policy = ScriptedPolicy(hand.actions)
+    game = TexasHoldemGame(num_bots=len(hand.chips) - 1, small_blind=hand.small_blind,
+                           headless=True, human_policy=policy, bot_policy=policy)
+    for seat, stack in enumerate(hand.chips):
+        game.chips[seat] = stack
+    game.state.dealer = hand.dealer
+    recorder = HandRecorder()
+    recorder.hands = hand.number
+    replayed = []
+    recorder.handle = replayed.append
+    game.observers.append(recorder)
+    game.play_hand(deck=hand.deck)
+    return replayed[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Inspect or replay a hand-history log')
+    parser.add_argument('path')
+    parser.add_argument('--replay', action='store_true', help='re-run every hand and report mismatches')
+    parser.add_argument('--show', type=int, default=0, help='print the first N hands')
+    args = parser.parse_args()
+
+    hands = mismatches = 0
+    for hand in read_hands(args.path):
+        hands += 1
+        if hands <= args.show:
+            print(f'Hand {hand.number}: deck {" ".join(card_to_str(c) for c in hand.deck[:20])} ...')
+            for action in hand.actions:
+                print(f'  seat {action.seat} {action.street:>8} {action.action:<11} {action.amount:>8} pot {action.pot}')
+            print(f'  stacks {hand.chips} -> {hand.final_chips}')
+        if args.replay and replay(hand) != hand:
+            mismatches += 1
+            print(f'Hand {hand.number} does not replay identically')
+    print(f'{hands} hands' + (f', {mismatches} replay mismatches' if args.replay else ''))
+
+
+if __name__ == '__main__':
+    main()
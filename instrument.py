@@ -0,0 +1,208 @@
+import time
+
+# Optional timing/counter registry for TexasHoldemGame. Pass Metrics() to the
+# game to collect per-phase timings; the default NULL_METRICS hands out one
+# shared no-op timer, so instrumented code costs a method call and nothing else.
+
+
+class Histogram:
+    __slots__ = ('count', 'total', 'min', 'max', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = float('inf')
+        self.max = 0.0
+        self.buckets = {}  # Power-of-two bucket -> count
+
+    def record(self, value):
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        bucket = int(value).bit_length()
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    def percentile(self, p):
+        # Upper edge of the bucket holding the p-th percentile
+        target = p / 100 * self.count
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= target:
+                return min(float(2 ** bucket), self.max)
+        return self.max
+
+    def merge(self, data):
+        self.count += data['count']
+        self.total += data['total']
+        self.min = min(self.min, data['min'])
+        self.max = max(self.max, data['max'])
+        for bucket, count in data['buckets'].items():
+            bucket = int(bucket)
+            self.buckets[bucket] = self.buckets.get(bucket, 0) + count
+
+    def to_dict(self):
+        return {'count': self.count, 'total': self.total, 'min': self.min, 'max': self.max,
+                'buckets': dict(self.buckets)}
+
+
+class Timer:
+    __slots__ = ('histogram', 'start')
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.record((time.perf_counter_ns() - self.start) / 1000)  # Microseconds
+
+
+def time_steps(steps, histogram):
+    elapsed = 0
+    reply = None
+    try:
+        while True:
+            start = time.perf_counter_ns()
+            try:
+                request = steps.send(reply)
+            except StopIteration as stop:
+                return stop.value
+            finally:
+                elapsed += time.perf_counter_ns() - start
+            reply = yield request
+    finally:
+        histogram.record(elapsed / 1000)
+
+
+class Metrics:
+    enabled = True
+
+    def __init__(self):
+        self.timers = {}
+        self.histograms = {}
+        self.counters = {}
+
+    def timer(self, name, street=None):
+        return Timer(self.histogram(name, street))
+
+    def histogram(self, name, street=None):
+        key = f'{name}.{street}' if street else name
+        histogram = self.timers.get(key)
+        if histogram is None:
+            histogram = self.timers[key] = Histogram()
+        return histogram
+
+    def add_time(self, name, microseconds, street=None):
+        # Book time measured elsewhere (e.g. one row's share of a batched call) under a timer
+        self.histogram(name, street).record(microseconds)
+
+    def timed_steps(self, name, steps):
+        # A step generator timed only while it runs: the time it spends
+        # suspended at a yield belongs to whoever answers it (and, under
+        # lockstep or the server, to the other tables)
+        return time_steps(steps, self.histogram(name))
+
+    def count(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def observe(self, name, value):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram()
+        histogram.record(value)
+
+    def to_dict(self):
+        return {
+            'timers_us': {name: h.to_dict() for name, h in self.timers.items()},
+            'histograms': {name: h.to_dict() for name, h in self.histograms.items()},
+            'counters': dict(self.counters),
+        }
+
+    def merge(self, data):
+        # Fold in another registry's to_dict(), e.g. from a worker process
+        for name, h in data['timers_us'].items():
+            self.timers.setdefault(name, Histogram()).merge(h)
+        for name, h in data['histograms'].items():
+            self.histograms.setdefault(name, Histogram()).merge(h)
+        for name, count in data['counters'].items():
+            self.count(name, count)
+
+    def to_json(self, **kwargs):
+        import json  # Only report writers need it; keeps game start-up lean
+        return json.dumps(self.to_dict(), **kwargs)
+
+    def report(self):
+        lines = [f"{'timer':<24} {'calls':>9} {'total ms':>11} {'mean us':>10} {'p50 us':>9} {'p99 us':>9} {'max us':>10}"]
+        for name in sorted(self.timers):
+            h = self.timers[name]
+            lines.append(f'{name:<24} {h.count:>9} {h.total / 1000:>11.1f} {h.total / h.count:>10.1f} '
+                         f'{h.percentile(50):>9.0f} {h.percentile(99):>9.0f} {h.max:>10.0f}')
+        for name in sorted(self.histograms):
+            h = self.histograms[name]
+            lines.append(f'{name:<24} {h.count:>9} {"":>11} {h.total / h.count:>10.2f} '
+                         f'{h.percentile(50):>9.0f} {h.percentile(99):>9.0f} {h.max:>10.0f}')
+        for name in sorted(self.counters):
+            lines.append(f'{name:<24} {self.counters[name]:>9}')
+        return '\n'.join(lines)
+
+
+class NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+class NullMetrics:
+    enabled = False
+    _timer = NullTimer()
+
+    def timer(self, name, street=None):
+        return self._timer
+
+    def add_time(self, name, microseconds, street=None):
+        pass
+
+    def timed_steps(self, name, steps):
+        return steps
+
+    def count(self, name, amount=1):
+        pass
+
+    def observe(self, name, value):
+        pass
+
+
+NULL_METRICS = NullMetrics()
+
+
+class TimedOutput:
+    # Output sink proxy that books write time under io.<street>
+    def __init__(self, output, game):
+        self.output = output
+        self.game = game
+        self.enabled = output.enabled
+
+    def write(self, *parts):
+        with self.game.metrics.timer('io', self.game.street):
+            self.output.write(*parts)
+
+
+class TimedSleep:
+    # Sleep proxy that books time under sleep.<street>
+    def __init__(self, sleep, game):
+        self.sleep = sleep
+        self.game = game
+
+    def __call__(self, seconds):
+        with self.game.metrics.timer('sleep', self.game.street):
+            self.sleep(seconds)
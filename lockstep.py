@@ -0,0 +1,67 @@
+import time
+
+from policy import DecisionBatch
+
+# Batch-synchronous play: many headless tables advance together, one
+# decision per table per step. Each table runs TexasHoldemGame.hand_steps();
+# the pending bot decisions of a step go out as one DecisionBatch per policy
+# (each table's game.policy unless one is given for all), and seats with
+# their own human_policy/bot_policy are answered one by one. A batched row's
+# decision.<street> time is its own equity work plus an equal share of its
+# batch's policy call.
+
+
+def play_lockstep(games, hands, policy=None, before_hand=None):
+    # Play `hands` hands in total, each table starting a new one as soon as
+    # its last ends; before_hand(game) runs ahead of every hand
+    remaining = [hands]
+    tables = []  # [game, steps, pending request]
+
+    def start(game):
+        while remaining[0] > 0:
+            remaining[0] -= 1
+            if before_hand:
+                before_hand(game)
+            steps = game.hand_steps()
+            try:
+                tables.append([game, steps, next(steps)])
+                return
+            except StopIteration:
+                pass  # Hand needed no decisions
+
+    for game in games:
+        start(game)
+
+    while tables:
+        batches = {}  # policy -> (DecisionBatch, indices of its rows in tables)
+        decisions = [None] * len(tables)
+        for i, (game, steps, request) in enumerate(tables):
+            player_index, current_bet, to_call, round_name = request
+            scripted = game.human_policy if player_index == 0 else game.bot_policy
+            if scripted or to_call < 0 or to_call > game.chips[player_index]:
+                decisions[i] = game.decide(*request)  # Own policy, or get_bot_action's fold
+                continue
+            started = time.perf_counter_ns()
+            strength = game.bot_hand_strength(player_index, to_call, round_name)
+            table_policy = policy or game.policy
+            if table_policy not in batches:
+                batches[table_policy] = DecisionBatch(), []
+            batch, batched = batches[table_policy]
+            batch.add(game, player_index, current_bet, to_call, round_name, strength, game.rng)
+            batched.append((i, time.perf_counter_ns() - started))
+        for table_policy, (batch, batched) in batches.items():
+            started = time.perf_counter_ns()
+            decided = table_policy.decide(batch)
+            share = (time.perf_counter_ns() - started) / len(batched)
+            for (i, elapsed), decision in zip(batched, decided):
+                decisions[i] = decision
+                game, _, request = tables[i]
+                game.metrics.add_time('decision', (elapsed + share) / 1000, request[3])  # Microseconds
+
+        stepped, tables = tables, []
+        for table, decision in zip(stepped, decisions):
+            try:
+                table[2] = table[1].send(decision)
+                tables.append(table)
+            except StopIteration:
+                start(table[0])
@@ -1,320 +1,411 @@
-import sys
 import time
-sys.path.append('.')
-from holdem_calc import holdem_calc
+from backends import get_backend
+from equity import batch_equity, exact_equity, range_tally
+from equity_cache import EquityCache
+from preflop import preflop_equity
+from ranges import Range, combo_strengths
+from board import BoardInfo
+from cards import HAND_NAMES, card_to_str, hand_category, hand_ranks
+from instrument import NULL_METRICS, TimedOutput, TimedSleep
+from output import ConsoleOutput, NullOutput
+from rng import deal_deck, stream
+from policy import DEFAULT_POLICY, ROUND_MULTIPLIERS, DecisionBatch
+from pots import award_pots
+from state import GameState
+from tracker import HandTracker
+import cards
 import random
 
+EMPTY_BOARD = BoardInfo(())
+BOARD_STREETS = {3: 'flop', 4: 'turn', 5: 'river'}  # Street a board of this size opens
+
+
 class TexasHoldemGame:
-    def __init__(self, num_bots=4, starting_chips=10000, small_blind=50):
+    def __init__(self, num_bots=4, starting_chips=10000, small_blind=50,
+                 headless=False, output=None, sleep=None, human_policy=None, bot_policy=None,
+                 metrics=None, equity_backend=None, equity_cache=None, policy=None, seed=None, table_id=0):
         self.num_players = num_bots + 1  # +1 for human player
         self.starting_chips = starting_chips
         self.small_blind = small_blind
         self.big_blind = small_blind * 2
+        # Headless tables never sleep or print, and seat 0 is played by
+        # human_policy (or by the bot logic when no policy is given)
+        self.headless = headless
+        self.output = output or (NullOutput() if headless else ConsoleOutput())
+        self.sleep = sleep or ((lambda seconds: None) if headless else time.sleep)
+        self.human_policy = human_policy
+        self.bot_policy = bot_policy  # Replaces get_bot_action for seats 1+ when given
+        self.policy = policy or DEFAULT_POLICY  # Batch decision rule behind get_bot_action (see policy.py)
+        self.interactive = not headless and human_policy is None
+        # Per-phase timings and counters (see instrument.py); a no-op unless given
+        self.metrics = metrics or NULL_METRICS
+        self.street = 'pre-flop'
+        self.equity_calls = 0  # Equity estimates this hand, whatever computed them
+        if self.metrics.enabled:
+            self.output = TimedOutput(self.output, self)
+            self.sleep = TimedSleep(self.sleep, self)
+        # Objects with on_hand_start(game), on_action(game, seat, street, action, amount)
+        # and on_hand_end(game), e.g. stats collectors and hand-history writers
+        self.observers = []
+        # Equity results survive across hands; isomorphic spots share entries
+        # e.g. an equity_store.PersistentEquityCache; an empty cache is falsy, hence the None test
+        self.equity_cache = EquityCache() if equity_cache is None else equity_cache
+        self.equity_samples = 0  # Samples drawn by estimate_hand_strength
+        self.equity_backend = equity_backend  # Backend name; None picks one on first use
+        # With a seed, hand n of this table draws only from streams keyed on
+        # (seed, table_id, n) (see rng.py); without one, from the global random
+        self.seed = seed
+        self.table_id = table_id
+        self.hand_number = 0
+        self.rng = random if seed is None else stream(seed, table_id)
+        # Display-only equity has its own stream, so what a table prints never changes how it plays
+        self.display_rng = random if seed is None else stream(seed, table_id, 'display')
+        self.state = GameState(self.num_players, starting_chips)
+        self.tracker = HandTracker(self.num_players)  # Made hands and draws, updated per card
+        self.ranges = [Range() for _ in range(self.num_players)]  # What each seat's play says it holds
         self.reset_game()
         self.initialize_players()
 
+    # Table state lives in self.state (see state.py); these keep the old names
+    @property
+    def chips(self):
+        return self.state.chips
+
+    @property
+    def players_in_hand(self):
+        return self.state.in_hand
+
+    @property
+    def community_cards(self):
+        return self.state.community_cards()
+
+    @property
+    def pot(self):
+        return self.state.pot
+
+    @pot.setter
+    def pot(self, value):
+        self.state.pot = value
+
+    @property
+    def current_dealer(self):
+        return self.state.dealer
+
+    def snapshot(self):
+        # Table state plus each seat's range weights and history, all as immutable copies
+        return self.state.snapshot(), tuple((bytes(hand_range.weights), bytes(hand_range.history))
+                                            for hand_range in self.ranges)
+
+    def restore(self, snapshot):
+        state, ranges = snapshot
+        self.state.restore(state)
+        for hand_range, (weights, history) in zip(self.ranges, ranges):
+            memoryview(hand_range.weights).cast('B')[:] = weights
+            hand_range.history[:] = history
+        self.combo_strengths_size = -1  # The board may have changed under the cached table
+        self.tracker.sync(self.state.holes, self.community_cards)
+        self.board_info = BoardInfo(self.community_cards)
+        self.table_equity_key = None
+
     def initialize_players(self):
         # Initialize chips and personalities for all players
-        self.chips = [self.starting_chips] * self.num_players
+        rng = random if self.seed is None else stream(self.seed, self.table_id, 'personalities')
+        for i in range(self.num_players):
+            self.chips[i] = self.starting_chips
         self.personalities = [0]  # Human player has no personality modifier
+        if self.headless and self.human_policy is None:
+            self.personalities[0] = rng.uniform(-0.2, 0.2)  # Seat 0 is a bot too
         for _ in range(self.num_players - 1):
-            self.personalities.append(random.uniform(-0.2, 0.2))  # Bot personalities
-
-    def reset_game(self):
-        # Reset game state for a new hand
-        self.pot = 0
-        self.community_cards = []
-        self.player_hands = {}
-        self.players_in_hand = [True] * self.num_players
-        self.current_dealer = 0
-        self.deck = self.create_deck()
-        random.shuffle(self.deck)
+            self.personalities.append(rng.uniform(-0.2, 0.2))  # Bot personalities
+
+    def reset_game(self, deck=None):
+        # Reset game state for a new hand, reusing the same buffers.
+        # A given deck order (e.g. from a hand history) replaces the shuffle.
+        self.state.new_hand(rng=self.rng, deck=deck)
+        self.street = 'pre-flop'
+        self.equity_calls = 0
+        self.table_equity = {}
+        self.table_equity_key = None
+        self.board_info = EMPTY_BOARD  # Shared board analysis, rebuilt once per street
+        for hand_range in self.ranges:
+            hand_range.reset()
+        self.combo_strengths_size = -1
 
     @staticmethod
     def create_deck():
-        suits = 'shdc'  # spades, hearts, diamonds, clubs
-        ranks = 'AKQJT98765432'
-        # Create cards in the format that holdem_calc expects (e.g., 'As' for Ace of spades)
-        return [rank + suit for rank in ranks for suit in suits]
+        # Cards are ints 0-51 (see cards.py); strings are only built for display
+        return cards.create_deck()
 
-    def get_hand_strength(self, player_index):
+    def get_hand_strength(self, player_index, rng=None):
         if not self.players_in_hand[player_index]:
             return 0
-        # Format hole cards and known opponent cards
-        board = self.community_cards if self.community_cards else None
-        hole_cards = [self.player_hands[player_index][0], self.player_hands[player_index][1], "?", "?"]
-        # Calculate probability against known opponent hands
-        probability = holdem_calc.calculate(board, False, 1, None, hole_cards , False)
-        prob = list(probability)  # type: ignore
-        return prob[0]  # Use win probability
-
-    def get_bot_action(self, player_index, current_bet, to_call, round_name):
-        # Validate bet amounts
-        if to_call < 0 or to_call > self.chips[player_index]:
-            return 'fold', 0
-
-        hand_strength = self.get_hand_strength(player_index)
+        with self.metrics.timer('equity', self.street):
+            if not self.community_cards:
+                # Pre-flop equity comes straight from the precomputed table
+                strength = preflop_equity(self.state.hand(player_index), 1)
+                if strength is not None:
+                    self.count_equity('preflop_table')
+                    return strength
+            if len(self.community_cards) >= 4:
+                # Turn and river are enumerated exactly against one random hand
+                method, compute = 'exact', lambda: self.exact_hand_strength(player_index)
+            else:
+                method = get_backend(self.equity_backend).name
+                compute = lambda: self.calculate_hand_strength(player_index, rng)
+            return self.equity_cache.lookup(self.state.hand(player_index), self.community_cards, 1, method,
+                                            compute)
+
+    def count_equity(self, source):
+        # One equity estimate, booked under equity.calls.<source> and in the per-hand total
+        self.equity_calls += 1
+        self.metrics.count(f'equity.calls.{source}')
+
+    def exact_hand_strength(self, player_index):
+        self.count_equity('exact')
+        return exact_equity(self.state.hand(player_index), self.board_info)
+
+    def calculate_hand_strength(self, player_index, rng=None):
+        # Equity against one random hand from the configured backend (see backends.py)
+        self.count_equity('backend')
+        return get_backend(self.equity_backend).equity(self.state.hand(player_index), self.community_cards,
+                                                       rng or self.rng)
+
+    def estimate_hand_strength(self, player_index, thresholds=()):
+        # Adaptive-precision equity against the live opponents' ranges (see
+        # equity.range_tally), carried on from the cache's tally for the spot
+        if not self.players_in_hand[player_index]:
+            return 0
+        strength = self.table_strength(player_index)
+        if strength is not None:
+            return strength
+        hand = self.state.hand(player_index)
+        ranges = self.opponent_ranges(player_index)
+
+        def extend(total, samples):
+            tally = range_tally(hand, self.board_info, ranges, thresholds, rng=self.rng, total=total, samples=samples)
+            self.equity_samples += tally[1] - samples
+            return tally
+
+        self.count_equity('range')
+        with self.metrics.timer('equity', self.street):
+            total, samples = self.equity_cache.range_lookup(hand, self.community_cards,
+                                                            self.opponent_histories(player_index), extend)
+        return total / samples
+
+    def table_strength(self, player_index):
+        # Pre-flop, until some live opponent's range has been narrowed, range
+        # equity is equity against random hands, which the table holds exactly.
+        # None when the table cannot answer.
+        if self.community_cards:
+            return None
+        opponents = self.live_opponents(player_index)
+        if any(self.ranges[seat].history for seat in opponents):
+            return None
+        with self.metrics.timer('equity', self.street):
+            strength = preflop_equity(self.state.hand(player_index), len(opponents))
+        if strength is not None:
+            self.count_equity('preflop_table')
+        return strength
+
+    def live_opponents(self, player_index):
+        return [seat for seat in range(self.num_players) if seat != player_index and self.players_in_hand[seat]]
+
+    def opponent_ranges(self, player_index):
+        # Weight vectors of every other seat still in the hand
+        return [self.ranges[seat].weights for seat in self.live_opponents(player_index)]
+
+    def opponent_histories(self, player_index):
+        # What the weights were narrowed by, which is all a cached tally needs to match
+        return [bytes(self.ranges[seat].history) for seat in self.live_opponents(player_index)]
+
+    def get_combo_strengths(self):
+        # Strength percentile of every combo on the current board, once per street
+        if self.combo_strengths_size != len(self.community_cards):
+            self.combo_strengths = combo_strengths(self.board_info, self.equity_cache)
+            self.combo_strengths_size = len(self.community_cards)
+        return self.combo_strengths
+
+    def bot_thresholds(self, player_index, to_call, round_name):
+        # Raw-equity cut-offs get_bot_action compares against; an estimate
+        # only has to be precise enough to land on the right side of each
         personality = self.personalities[player_index]
-        adjusted_strength = hand_strength + personality
-
-        # Calculate pot odds
         pot_odds = to_call / (self.pot + to_call) if to_call > 0 else 0
-
-        # Adjust aggression based on round
-        round_multiplier = {
-            'pre-flop': 0.7,  # Less conservative
-            'flop': 0.8,     # Less conservative
-            'turn': 0.9,     # Same
-            'river': 1.0     # Normal
-        }.get(round_name, 1.0)
-
-        # Very strong hand
-        if adjusted_strength >= 0.35:  # Adjusted threshold
-            raise_threshold = 0.4 * round_multiplier
-            if random.random() < raise_threshold:
-                max_raise = min(
-                    self.chips[player_index],
-                    current_bet * 2.5,
-                    self.pot * 2
-                )
-                return 'raise', max_raise
-            return 'call', min(to_call, self.chips[player_index])
-
-        # Strong hand
-        elif adjusted_strength >= 0.25:  # Adjusted threshold
-            raise_threshold = 0.3 * round_multiplier
-            if random.random() < raise_threshold:
-                max_raise = min(
-                    self.chips[player_index],
-                    current_bet * 2,
-                    self.pot * 1.5
-                )
-                return 'raise', max_raise
-            return 'call', min(to_call, self.chips[player_index])
-
-        # Medium hand
-        elif adjusted_strength >= 0.15:  # Adjusted threshold
-            required_pot_odds = adjusted_strength - (0.05 * round_multiplier)
-            if pot_odds <= required_pot_odds:
-                return 'call', min(to_call, self.chips[player_index])
-            return 'fold', 0
-
-<<<<<<< HEAD
-        # Weak hand
-=======
-        # River
-        deal_community_cards(1)
-        betting_round("Post-River")
-
-        # Showdown
-        showdown()
-
-        # Reset for next hand
-        reset_game()
-    
-def deal_cards():
-    for player in range(players_amount):
-        players_hands[player] = [playing_cards.pop(0), playing_cards.pop(0)]
-
-def deal_community_cards(num_cards):
-    for _ in range(num_cards):
-        community_cards.append(playing_cards.pop(0))
-
-def betting_round(round_name):
-    current_bet = small_blind_amount if round_name == "Pre-Flop" else 0
-    current_player = find_first_player_index(big_blind_index)
-
-    while True:
-        if players_in_game[current_player]:
-            if current_player == 0:  # Human player
-                # Get user input for action
-                action = get_user_action()
-            else:  # Computer player
-                action = computer_action(current_player, current_bet, pot_size, community_cards)
-
-            # Process the action
-            if action == "fold":
-                players_in_game[current_player] = 0
-            elif action == "check" or action == "call":
-                pot_size += current_bet
-            elif action == "raise":
-                raise_amount = get_raise_amount(current_player, current_bet)
-                pot_size += raise_amount
-                current_bet = raise_amount
-
-        current_player = (current_player + 1) % players_amount
-
-        # Check if betting round is over
-        if all(player_in_game == 0 or player_bet == current_bet for player_in_game, player_bet in zip(players_in_game, player_bets)):
-            break
-
-def get_user_action():
-    while True:
-        action = input("Enter your action (fold/check/call/raise): ").lower()
-        if action in ["fold", "check", "call"]:
-            return action
-        elif action == "raise":
-            while True:
-                try:
-                    raise_amount = int(input("Enter raise amount: "))
-                    if raise_amount > 0:
-                        return "raise", raise_amount
-                    else:
-                        print("Raise amount must be positive.")
-                except ValueError:
-                    print("Invalid input. Please enter a number.")
->>>>>>> parent of 0c7c880 (Update main.py)
-        else:
-            bluff_threshold = 0.05 * round_multiplier
-            if pot_odds < 0.1 and random.random() < bluff_threshold:
-                return 'call', min(to_call, self.chips[player_index])
+        thresholds = [cutoff - personality for cutoff in (0.15, 0.25, 0.35)]
+        thresholds.append(pot_odds + 0.05 * ROUND_MULTIPLIERS.get(round_name, 1.0) - personality)
+        return thresholds
+
+    def bot_hand_strength(self, player_index, to_call, round_name):
+        # Equity against the opponents' ranges on every street, sampled only
+        # until it is clear which side of each cut-off the hand is on
+        thresholds = self.bot_thresholds(player_index, to_call, round_name)
+        return self.estimate_hand_strength(player_index, thresholds)
+
+    def get_bot_action(self, player_index, current_bet, to_call, round_name, hand_strength=None):
+        # hand_strength may be precomputed by the caller (e.g. in a worker process)
+        # Validate bet amounts
+        if to_call < 0 or to_call > self.chips[player_index]:
             return 'fold', 0
+        if hand_strength is None:
+            hand_strength = self.bot_hand_strength(player_index, to_call, round_name)
+        batch = DecisionBatch()
+        batch.add(self, player_index, current_bet, to_call, round_name, hand_strength, self.rng)
+        return self.policy.decide(batch)[0]
 
     def display_game_state(self, show_all_cards=False, debug=True):
-        print('\n' + '-'*50)
-        print('Community Cards:', ' '.join(self.format_cards(self.community_cards)))
-        print(f'Pot: {self.pot}')
+        if not self.output.enabled:
+            return  # Skip the equity work behind the display
+        self.output.write('\n' + '-'*50)
+        self.output.write('Community Cards:', ' '.join(self.format_cards(self.community_cards)))
+        self.output.write(f'Pot: {self.pot}')
         
+        # With every hand on show, one batched call scores all seats at once
+        if show_all_cards or debug:
+            strengths = self.get_table_equity()
+        else:
+            strengths = {0: self.get_hand_strength(0, self.display_rng)} if self.players_in_hand[0] else {}
+
         # Show player's cards and strength
-        player_cards = self.format_cards(self.player_hands.get(0, []))
-        player_strength = self.get_hand_strength(0) if self.players_in_hand[0] else 0
-        print(f'Your cards: {" ".join(player_cards)} (strength: {player_strength:.2%})')
-        print(f'Your chips: {self.chips[0]}')
+        player_cards = self.format_cards(self.state.hand(0))
+        player_strength = strengths.get(0, 0)
+        self.output.write(f'Your cards: {" ".join(player_cards)} (strength: {player_strength:.2%})')
+        self.output.write(f'Your chips: {self.chips[0]}')
         
         # Show other players' information, cards and strengths if in debug mode
         for i in range(1, self.num_players):
             if self.players_in_hand[i]:
-                bot_strength = self.get_hand_strength(i)
                 if show_all_cards or debug:
-                    bot_cards = self.format_cards(self.player_hands[i])
-                    print(f'Bot {i} cards: {" ".join(bot_cards)} (strength: {bot_strength:.2%}, chips: {self.chips[i]})')
+                    bot_cards = self.format_cards(self.state.hand(i))
+                    self.output.write(f'Bot {i} cards: {" ".join(bot_cards)} (strength: {strengths[i]:.2%}, chips: {self.chips[i]})')
                 else:
-                    print(f'Bot {i} chips: {self.chips[i]}')
+                    self.output.write(f'Bot {i} chips: {self.chips[i]}')
+
+    def get_table_equity(self):
+        # Showdown equity of each live seat against the other live hands,
+        # reused until someone folds or the board changes
+        seats = [i for i in range(self.num_players) if self.players_in_hand[i]]
+        key = (tuple(seats), len(self.community_cards))
+        if key != self.table_equity_key:
+            self.count_equity('table')
+            with self.metrics.timer('equity', self.street):
+                equities = batch_equity([self.state.hand(i) for i in seats], self.board_info, rng=self.display_rng)
+            self.table_equity = dict(zip(seats, equities))
+            self.table_equity_key = key
+        return self.table_equity
+
+    def get_hand_value(self, player_index):
+        # Total-order strength key of the best 5-card hand (see cards.evaluate)
+        if not self.players_in_hand[player_index]:
+            return -1
+        return self.tracker.value(player_index)
+
+    def get_draws(self, player_index):
+        # (flush draw, ranks that complete a straight, outs that improve the hand)
+        tracker = self.tracker
+        return (tracker.flush_draw(player_index), tracker.straight_draw(player_index),
+                len(tracker.outs(player_index)))
 
     def get_hand_rank(self, player_index):
         if not self.players_in_hand[player_index]:
             return -1
-        cards = self.player_hands[player_index] + self.community_cards
-        ranks = [card[0] for card in cards]
-        suits = [card[1] for card in cards]
-        rank_values = {'2':2, '3':3, '4':4, '5':5, '6':6, '7':7, '8':8, '9':9, 'T':10, 'J':11, 'Q':12, 'K':13, 'A':14}
-        numeric_ranks = [rank_values[r] for r in ranks]
-        numeric_ranks.sort(reverse=True)
-        
-        # Check for flush
-        is_flush = any(suits.count(s) >= 5 for s in 'shdc')
-        
-        # Check for straight
-        straight_ranks = list(set(numeric_ranks))  # Remove duplicates
-        straight_ranks.sort(reverse=True)
-        
-        # Check for regular straight
-        is_straight = False
-        for i in range(len(straight_ranks) - 4):
-            if straight_ranks[i] - straight_ranks[i+4] == 4:
-                is_straight = True
-                break
-                
-        # Check for Ace-low straight (A,2,3,4,5)
-        if not is_straight and 14 in straight_ranks:  # If we have an Ace
-            ace_low = [14, 2, 3, 4, 5]
-            if all(r in straight_ranks for r in ace_low):
-                is_straight = True
-                # Move Ace to the end for proper ranking
-                straight_ranks.remove(14)
-                straight_ranks.append(1)
-        
-        # Count frequencies
-        rank_counts = {}
-        for r in numeric_ranks:
-            rank_counts[r] = rank_counts.get(r, 0) + 1
-        frequencies = sorted(rank_counts.values(), reverse=True)
-        
-        # Determine hand rank
-        if is_straight and is_flush:
-            return 8  # Straight flush
-        elif 4 in frequencies:
-            return 7  # Four of a kind
-        elif frequencies[:2] == [3, 2]:
-            return 6  # Full house
-        elif is_flush:
-            return 5  # Flush
-        elif is_straight:
-            return 4  # Straight
-        elif frequencies[0] == 3:
-            return 3  # Three of a kind
-        elif frequencies[:2] == [2, 2]:
-            return 2  # Two pair
-        elif frequencies[0] == 2:
-            return 1  # One pair
-        else:
-            return 0  # High card
+        return hand_category(self.get_hand_value(player_index))
 
     def get_kickers(self, player_index):
+        # Ranks that decide ties within the hand category, best 5 cards only
         if not self.players_in_hand[player_index]:
             return []
-        cards = self.player_hands[player_index] + self.community_cards
-        rank_values = {'2':2, '3':3, '4':4, '5':5, '6':6, '7':7, '8':8, '9':9, 'T':10, 'J':11, 'Q':12, 'K':13, 'A':14}
-        return sorted([rank_values[card[0]] for card in cards], reverse=True)
+        return hand_ranks(self.get_hand_value(player_index))
 
     def showdown(self):
-        print('\n' + '='*50)
-        print('SHOWDOWN')
-        print('='*50)
+        self.street = 'showdown'
+        self.output.write('\n' + '='*50)
+        self.output.write('SHOWDOWN')
+        self.output.write('='*50)
         
         # Display all cards
         self.display_game_state(show_all_cards=True)
         
-        best_rank = -1
-        winners = []
-        
-        # First compare hand ranks
-        for player in range(self.num_players):
-            if self.players_in_hand[player]:
-                hand_rank = self.get_hand_rank(player)
-                if hand_rank > best_rank:
-                    best_rank = hand_rank
-                    winners = [player]
-                elif hand_rank == best_rank:
-                    # If same rank, compare kickers
-                    if winners:
-                        winner_kickers = self.get_kickers(winners[0])
-                        player_kickers = self.get_kickers(player)
-                        for w_kick, p_kick in zip(winner_kickers, player_kickers):
-                            if p_kick > w_kick:
-                                winners = [player]
-                                break
-                            elif p_kick < w_kick:
-                                break
-                        else:
-                            winners.append(player)  # Exactly equal hands
-                    else:
-                        winners.append(player)
-        
-        # Split pot among winners
-        split_amount = self.pot // len(winners)
-        for winner in winners:
-            self.chips[winner] += split_amount
-            hand_names = ['High Card', 'One Pair', 'Two Pair', 'Three of a Kind', 
-                         'Straight', 'Flush', 'Full House', 'Four of a Kind', 'Straight Flush']
-            if winner == 0:
-                print(f'You win {split_amount} with {hand_names[best_rank]}')
+        # One strength key per seat (-1 if folded), resolved pot by pot
+        # against each seat's contribution; equal keys split
+        with self.metrics.timer('evaluation', self.street):
+            values = [self.get_hand_value(player) for player in range(self.num_players)]
+            contributed = self.state.contributed
+            payouts = award_pots(contributed, values, self.current_dealer, self.pot - sum(contributed))
+
+        for player, amount in enumerate(payouts):
+            if not amount:
+                continue
+            self.chips[player] += amount
+            if values[player] < 0:  # Folded: an uncalled bet coming back
+                self.output.write(f"{'You get' if player == 0 else f'Bot {player} gets'} {amount} back")
+                continue
+            hand_name = HAND_NAMES[hand_category(values[player])]
+            if player == 0:
+                self.output.write(f'You win {amount} with {hand_name}')
             else:
-                print(f'Bot {winner} wins {split_amount} with {hand_names[best_rank]}')
+                self.output.write(f'Bot {player} wins {amount} with {hand_name}')
         self.pot = 0
 
     @staticmethod
     def format_cards(cards):
-        return [card.replace('s', '♠').replace('h', '♥')
+        return [card_to_str(card).replace('s', '♠').replace('h', '♥')
                     .replace('d', '♦').replace('c', '♣') for card in cards]
 
+    def commit_chips(self, seat, amount):
+        # Move chips from a stack into the pot, booked against the seat for side pots
+        self.chips[seat] -= amount
+        self.state.bets[seat] += amount
+        self.state.contributed[seat] += amount
+        self.pot += amount
+
+    def notify_action(self, seat, street, action, amount):
+        if action == 'raise' or action == 'call' and amount:
+            # Checks and blinds say nothing
+            self.ranges[seat].narrow(action, self.get_combo_strengths(), len(self.community_cards))
+        for observer in self.observers:
+            observer.on_action(self, seat, street, action, amount)
+
     def betting_round(self, round_name):
+        self.run_steps(self.betting_steps(round_name))
+
+    def run_steps(self, steps):
+        # Drive a step generator synchronously, answering each decision request
+        try:
+            request = next(steps)
+            while True:
+                request = steps.send(self.decide(*request))
+        except StopIteration:
+            pass
+
+    def decide(self, player_index, current_bet, to_call, round_name):
+        if player_index == 0 and self.interactive:  # Human player at the console
+            action = input('Your action (fold/call/raise): ').lower()
+            amount = None
+            if action == 'raise':
+                try:
+                    amount = int(input('Raise to: '))
+                except ValueError:
+                    pass
+            return action, amount
+        with self.metrics.timer('decision', round_name):
+            if player_index == 0 and self.human_policy:
+                return self.human_policy(self, player_index, current_bet, to_call, round_name)
+            if player_index != 0 and self.bot_policy:
+                return self.bot_policy(self, player_index, current_bet, to_call, round_name)
+            return self.get_bot_action(player_index, current_bet, to_call, round_name)
+
+    def betting_steps(self, round_name):
+        # Generator form of a betting round. Every time a seat has to act it
+        # yields (seat, current_bet, to_call, round_name) and expects the
+        # decision (action, amount) to be sent back, so the same rules run
+        # under the blocking console loop and under the asyncio server.
+        self.street = round_name
         # Display initial state at the start of each round
-        print('\n' + '-'*20 + f' {round_name.upper()} ' + '-'*20)
+        self.output.write('\n' + '-'*20 + f' {round_name.upper()} ' + '-'*20)
         self.display_game_state()
         
         current_bet = self.big_blind if round_name == 'pre-flop' else 0
-        player_bets = [0] * self.num_players
+        self.state.clear_bets()
+        player_bets = self.state.bets
         players_acted = [False] * self.num_players
         active_players = sum(self.players_in_hand)
 
@@ -325,15 +416,13 @@ def get_user_action():
             
             # Post small blind
             sb_amount = min(self.small_blind, self.chips[sb_pos])
-            self.chips[sb_pos] -= sb_amount
-            player_bets[sb_pos] = sb_amount
-            self.pot += sb_amount
+            self.commit_chips(sb_pos, sb_amount)
+            self.notify_action(sb_pos, round_name, 'small blind', sb_amount)
             
             # Post big blind
             bb_amount = min(self.big_blind, self.chips[bb_pos])
-            self.chips[bb_pos] -= bb_amount
-            player_bets[bb_pos] = bb_amount
-            self.pot += bb_amount
+            self.commit_chips(bb_pos, bb_amount)
+            self.notify_action(bb_pos, round_name, 'big blind', bb_amount)
             current_bet = bb_amount
 
         # Continue betting until all players have acted and bets are equal
@@ -346,87 +435,93 @@ def get_user_action():
 
             to_call = current_bet - player_bets[current_player]
 
-            if current_player == 0:  # Human player
+            if self.chips[current_player] == 0:
+                pass  # All-in: nothing left to decide
+            elif current_player == 0 and self.interactive:  # Human player
                 self.display_game_state()
-                print(f'\nTo call: {to_call}')
-                action = input('Your action (fold/call/raise): ').lower()
-                
+                self.output.write(f'\nTo call: {to_call}')
+                action, raise_amount = yield current_player, current_bet, to_call, round_name
+                action = action.lower()
+
                 if action == 'fold':
                     self.players_in_hand[current_player] = False
                     active_players -= 1
+                    self.notify_action(current_player, round_name, 'fold', 0)
                 elif action in ['call', 'check']:
+                    call_amount = 0
                     if to_call > 0:
                         call_amount = min(to_call, self.chips[current_player])
-                        self.chips[current_player] -= call_amount
-                        player_bets[current_player] += call_amount
-                        self.pot += call_amount
+                        self.commit_chips(current_player, call_amount)
+                    self.notify_action(current_player, round_name, 'call', call_amount)
                 elif action == 'raise':
-                    try:
-                        raise_amount = int(input('Raise to: '))
-                        if raise_amount <= 0:
-                            print('Raise amount must be positive')
-                            continue
-                        if raise_amount <= current_bet:
-                            print('Raise amount must be greater than current bet')
-                            continue
-                        if raise_amount > self.chips[current_player] + player_bets[current_player]:
-                            print('Not enough chips')
-                            continue
-                            
-                        # Limit raise based on round and pot size
-                        max_raise_multiplier = {
-                            'pre-flop': 2,   # Max 2x current bet in pre-flop
-                            'flop': 2.5,     # Max 2.5x in flop
-                            'turn': 3,       # Max 3x in turn
-                            'river': 4       # Max 4x in river
-                        }.get(round_name, 2)
-                        
-                        max_raise = min(
-                            self.chips[current_player] + player_bets[current_player],
-                            max(current_bet * max_raise_multiplier, self.big_blind),  # Ensure minimum raise is at least big blind
-                            self.pot * 2  # Limit raise to 2x pot
-                        )
+                    if raise_amount is None:
+                        self.output.write('Please enter a valid number')
+                        continue
+                    if raise_amount <= 0:
+                        self.output.write('Raise amount must be positive')
+                        continue
+                    if raise_amount <= current_bet:
+                        self.output.write('Raise amount must be greater than current bet')
+                        continue
+                    if raise_amount > self.chips[current_player] + player_bets[current_player]:
+                        self.output.write('Not enough chips')
+                        continue
                         
-                        if raise_amount > max_raise:
-                            print(f'Maximum raise allowed is {max_raise}')
-                            continue
-                            
-                        additional = raise_amount - player_bets[current_player]
-                        self.chips[current_player] -= additional
-                        player_bets[current_player] += additional
-                        self.pot += additional
-                        current_bet = raise_amount
-                        players_acted = [False] * self.num_players
-                        players_acted[current_player] = True
-                    except ValueError:
-                        print('Please enter a valid number')
+                    # Limit raise based on round and pot size
+                    max_raise_multiplier = {
+                        'pre-flop': 2,   # Max 2x current bet in pre-flop
+                        'flop': 2.5,     # Max 2.5x in flop
+                        'turn': 3,       # Max 3x in turn
+                        'river': 4       # Max 4x in river
+                    }.get(round_name, 2)
+                    
+                    max_raise = min(
+                        self.chips[current_player] + player_bets[current_player],
+                        max(current_bet * max_raise_multiplier, self.big_blind),  # Ensure minimum raise is at least big blind
+                        self.pot * 2  # Limit raise to 2x pot
+                    )
+                    
+                    if raise_amount > max_raise:
+                        self.output.write(f'Maximum raise allowed is {max_raise}')
                         continue
-            else:  # Bot players
-                action, amount = self.get_bot_action(current_player, current_bet, to_call, round_name)
-                time.sleep(1)  # Add delay for readability
+                        
+                    additional = raise_amount - player_bets[current_player]
+                    self.commit_chips(current_player, additional)
+                    current_bet = raise_amount
+                    players_acted = [False] * self.num_players
+                    players_acted[current_player] = True
+                    self.notify_action(current_player, round_name, 'raise', raise_amount)
+            else:  # Bot players and scripted seats
+                action, amount = yield current_player, current_bet, to_call, round_name
+                self.sleep(1)  # Add delay for readability
+                name = f'Bot {current_player}' if current_player else 'Player 0'
+                if action == 'raise':
+                    amount = min(int(amount), self.chips[current_player] + player_bets[current_player])
+                    if amount <= current_bet:
+                        action = 'call'  # Not a real raise; just match the bet
                 
                 if action == 'fold':
                     self.players_in_hand[current_player] = False
                     active_players -= 1
-                    print(f'Bot {current_player} folds')
-                elif action == 'call':
+                    self.output.write(f'{name} folds')
+                    self.notify_action(current_player, round_name, 'fold', 0)
+                elif action in ['call', 'check']:
                     call_amount = min(to_call, self.chips[current_player])
-                    self.chips[current_player] -= call_amount
-                    player_bets[current_player] += call_amount
-                    self.pot += call_amount
-                    print(f'Bot {current_player} calls {call_amount}')
+                    self.commit_chips(current_player, call_amount)
+                    self.output.write(f'{name} calls {call_amount}')
+                    self.notify_action(current_player, round_name, 'call', call_amount)
                 else:  # raise
                     additional = amount - player_bets[current_player]
-                    self.chips[current_player] -= additional
-                    player_bets[current_player] += additional
-                    self.pot += additional
+                    self.commit_chips(current_player, additional)
                     current_bet = amount
                     players_acted = [False] * self.num_players
                     players_acted[current_player] = True
-                    print(f'Bot {current_player} raises to {amount}')
+                    self.output.write(f'{name} raises to {amount}')
+                    self.notify_action(current_player, round_name, 'raise', amount)
 
             players_acted[current_player] = True
-            time.sleep(1)  # Add delay after each action
+            if self.chips[current_player]:
+                self.sleep(1)  # Add delay after each action
             
             # Check if betting round is complete
             if active_players == 1:
@@ -438,70 +533,98 @@ def get_user_action():
                     all_acted = False
                     break
                     
-            if all_acted and all(not self.players_in_hand[p] or player_bets[p] == current_bet 
+            if all_acted and all(not self.players_in_hand[p] or player_bets[p] == current_bet or not self.chips[p]
                                 for p in range(self.num_players)):
                 return
                 
             current_player = (current_player + 1) % self.num_players
 
-    def play_hand(self):
-        self.reset_game()
+    def play_hand(self, deck=None):
+        self.run_steps(self.hand_steps(deck))
+
+    def hand_steps(self, deck=None):
+        # One whole hand as a step generator (see betting_steps)
+        if self.seed is not None:
+            if deck is None:
+                deck = deal_deck(self.seed, self.table_id, self.hand_number)
+            self.rng = stream(self.seed, self.table_id, self.hand_number)
+            self.display_rng = stream(self.seed, self.table_id, self.hand_number, 'display')
+            self.hand_number += 1
+        self.reset_game(deck)
         self.deal_hole_cards()
-        
-        print('\n' + '='*50)
-        print('NEW HAND STARTING')
-        print('='*50 + '\n')
-        time.sleep(1)
+        for observer in self.observers:
+            observer.on_hand_start(self)
+        # The game's own work only; decisions are timed where they are made
+        yield from self.metrics.timed_steps('hand', self.street_steps())
+        self.metrics.observe('equity.calls_per_hand', self.equity_calls)
+        for observer in self.observers:
+            observer.on_hand_end(self)
+
+    def street_steps(self):
+        self.output.write('\n' + '='*50)
+        self.output.write('NEW HAND STARTING')
+        self.output.write('='*50 + '\n')
+        self.sleep(1)
         
         # Pre-flop
-        print('\n' + '-'*20 + ' PRE-FLOP ' + '-'*20)
-        self.betting_round('pre-flop')
+        self.output.write('\n' + '-'*20 + ' PRE-FLOP ' + '-'*20)
+        yield from self.betting_steps('pre-flop')
         if sum(self.players_in_hand) == 1:
             return self.award_pot()
             
         # Flop
-        print('\n' + '-'*20 + ' FLOP ' + '-'*20)
+        self.output.write('\n' + '-'*20 + ' FLOP ' + '-'*20)
         self.deal_community_cards(3)
-        self.betting_round('flop')
+        yield from self.betting_steps('flop')
         if sum(self.players_in_hand) == 1:
             return self.award_pot()
             
         # Turn
-        print('\n' + '-'*20 + ' TURN ' + '-'*20)
+        self.output.write('\n' + '-'*20 + ' TURN ' + '-'*20)
         self.deal_community_cards(1)
-        self.betting_round('turn')
+        yield from self.betting_steps('turn')
         if sum(self.players_in_hand) == 1:
             return self.award_pot()
             
         # River
-        print('\n' + '-'*20 + ' RIVER ' + '-'*20)
+        self.output.write('\n' + '-'*20 + ' RIVER ' + '-'*20)
         self.deal_community_cards(1)
-        self.betting_round('river')
+        yield from self.betting_steps('river')
         if sum(self.players_in_hand) == 1:
             return self.award_pot()
             
-        print('\n' + '-'*20 + ' SHOWDOWN ' + '-'*20)
+        self.output.write('\n' + '-'*20 + ' SHOWDOWN ' + '-'*20)
         self.showdown()
 
     def award_pot(self):
-        for i in range(self.num_players):
-            if self.players_in_hand[i]:
-                self.chips[i] += self.pot
-                print(f'Player {i} wins {self.pot}')
-                break
+        # Everyone else folded: the survivor wins every level it matched, and
+        # whatever it never matched goes back to the seats that paid it
+        values = [0 if in_hand else -1 for in_hand in self.players_in_hand]
+        contributed = self.state.contributed
+        payouts = award_pots(contributed, values, self.current_dealer, self.pot - sum(contributed))
+        for i, amount in enumerate(payouts):
+            if not amount:
+                continue
+            self.chips[i] += amount
+            if values[i] < 0:
+                self.output.write(f'Player {i} gets {amount} back')
+            else:
+                self.output.write(f'Player {i} wins {amount}')
         self.pot = 0
 
     def deal_hole_cards(self):
         # Deal two cards to each player
-        for i in range(self.num_players):
-            # Take two cards from the top of the deck
-            player_cards = [self.deck.pop(), self.deck.pop()]
-            self.player_hands[i] = player_cards
+        self.state.deal_hole_cards()
+        self.tracker.reset(self.state.holes)
 
     def deal_community_cards(self, num_cards):
         # Deal specified number of community cards
-        for _ in range(num_cards):
-            self.community_cards.append(self.deck.pop())
+        start = self.state.board_size
+        self.state.deal_board(num_cards)
+        with self.metrics.timer('evaluation', BOARD_STREETS[self.state.board_size]):
+            for card in self.state.board[start:self.state.board_size]:
+                self.tracker.add(card)
+        self.board_info = BoardInfo(self.community_cards)
 
 def main():
     # Get number of bots from user
@@ -514,7 +637,6 @@ def main():
         except ValueError:
             print('Please enter a valid number')
     
-<<<<<<< HEAD
     # Initialize and start the game
     game = TexasHoldemGame(num_bots=num_bots)
     
@@ -527,46 +649,3 @@ def main():
 
 if __name__ == '__main__':
     main()
-=======
-    # Distribute the pot to the winner(s)
-    # ...
-                
-def computer_action(player_index, current_bet, pot_size, community_cards):
-    hand_strength = handvalue(players_hands[player_index], community_cards)
-    personality = personalities[player_index]
-
-    # Implement decision-making logic based on hand strength, personality, pot odds, and other factors
-    # ...
-
-    return action  # "fold", "check", "call", or "raise"
-
-def get_computer_raise_amount(player_index, current_bet, pot_size, community_cards):
-    hand_strength = handvalue(players_hands[player_index], community_cards)
-    personality = personalities[player_index]
-    
-
-playing = 1
-while playing: 
-  """define global values"""
-  players_amount = 5
-  if players_amount < 2 or players_amount > 12:
-      print("The players amount is invalid.")
-      break
-  print(players_amount)
-  players_in_game = [1] * players_amount # an array to represent each player still in the game or not players_in_game[0] is the user
-  rounds_played = 0 #used to keep track of how many games played
-  small_blind_index = rounds_played / players_amount #the player index of the small blind should increment evertime game ends. 
-  big_blind_index = small_blind_index + 1
-  deck = deck_generator()
-  suffled_deck = suffle(deck)
-  playing_cards = suffled_deck[0 : 2 * players_amount + 5]
-  players_hands = {}
-  community_cards = []
-  personalities = []
-  for i in range(1,players_amount):
-    personalities[i] = personality()  
-  chip_stack = [10000] * players_amount
-  pot_size = 0
-  game_loop()
-  playing = 0
->>>>>>> parent of 0c7c880 (Update main.py)
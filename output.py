@@ -0,0 +1,29 @@
+# Output sinks for TexasHoldemGame. Every sink takes print-style arguments;
+# `enabled` lets the game skip building output nobody will see.
+
+
+class NullOutput:
+    enabled = False
+
+    def write(self, *parts):
+        pass
+
+
+class ConsoleOutput:
+    enabled = True
+
+    def write(self, *parts):
+        print(*parts)
+
+
+class LogOutput:
+    enabled = True
+
+    def __init__(self, logger=None, level=None):
+        import logging  # Deferred so console and headless games never load it
+        self.logger = logger or logging.getLogger('holdem')
+        self.level = logging.INFO if level is None else level
+
+    def write(self, *parts):
+        if self.logger.isEnabledFor(self.level):
+            self.logger.log(self.level, ' '.join(str(part) for part in parts).strip('\n'))
@@ -0,0 +1,83 @@
+import random
+
+# Batch decision API for bots. A DecisionBatch holds one row per (table,
+# seat) awaiting a decision, stored column-wise, and a Policy turns a whole
+# batch into a list of (action, amount) in one call. TexasHoldemGame asks
+# its policy with single-row batches; lockstep.py steps many tables at once
+# and sends every pending bot decision through one batch.
+
+# Per-street aggression scaling
+ROUND_MULTIPLIERS = {
+    'pre-flop': 0.7,  # Less conservative
+    'flop': 0.8,     # Less conservative
+    'turn': 0.9,     # Same
+    'river': 1.0     # Normal
+}
+
+
+class DecisionBatch:
+    __slots__ = ('strength', 'personality', 'pot_odds', 'round_multiplier', 'to_call', 'chips',
+                 'current_bet', 'pot', 'draw')
+
+    def __init__(self):
+        for column in self.__slots__:
+            setattr(self, column, [])
+
+    def add(self, game, player_index, current_bet, to_call, round_name, hand_strength, rng=random):
+        self.strength.append(hand_strength)
+        self.personality.append(game.personalities[player_index])
+        self.pot_odds.append(to_call / (game.pot + to_call) if to_call > 0 else 0)
+        self.round_multiplier.append(ROUND_MULTIPLIERS.get(round_name, 1.0))
+        self.to_call.append(to_call)
+        self.chips.append(game.chips[player_index])
+        self.current_bet.append(current_bet)
+        self.pot.append(game.pot)
+        self.draw.append(rng.random())  # One uniform per row for any randomised choice
+
+    def __len__(self):
+        return len(self.strength)
+
+
+class Policy:
+    def decide(self, batch):
+        # Return one (action, amount) per row of the DecisionBatch
+        raise NotImplementedError
+
+
+class HeuristicPolicy(Policy):
+    # The original bot: equity plus personality, against pot odds, tiered by street
+    def decide(self, batch):
+        decisions = []
+        for strength, personality, pot_odds, multiplier, to_call, chips, current_bet, pot, draw in zip(
+                batch.strength, batch.personality, batch.pot_odds, batch.round_multiplier, batch.to_call,
+                batch.chips, batch.current_bet, batch.pot, batch.draw):
+            adjusted_strength = strength + personality
+            call = ('call', min(to_call, chips))
+
+            # Very strong hand
+            if adjusted_strength >= 0.35:
+                if draw < 0.4 * multiplier:
+                    decisions.append(('raise', min(chips, current_bet * 2.5, pot * 2)))
+                else:
+                    decisions.append(call)
+
+            # Strong hand
+            elif adjusted_strength >= 0.25:
+                if draw < 0.3 * multiplier:
+                    decisions.append(('raise', min(chips, current_bet * 2, pot * 1.5)))
+                else:
+                    decisions.append(call)
+
+            # Medium hand
+            elif adjusted_strength >= 0.15:
+                required_pot_odds = adjusted_strength - (0.05 * multiplier)
+                decisions.append(call if pot_odds <= required_pot_odds else ('fold', 0))
+
+            # Weak hand
+            else:
+                bluff = pot_odds < 0.1 and draw < 0.05 * multiplier
+                decisions.append(call if bluff else ('fold', 0))
+        return decisions
+
+
+DEFAULT_POLICY = HeuristicPolicy()
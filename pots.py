@@ -0,0 +1,54 @@
+# Side-pot resolution from per-seat contributions. Seats are sorted by how
+# much they put in; walking that order from the biggest contributor down,
+# each distinct contribution level forms one pot that every seat at or above
+# it paid into, and the best live hand among those seats wins it. The running
+# best hand is carried down the walk, so after the sort the whole thing is
+# linear. Levels above every live seat's contribution were never matched, so
+# nobody can win them: they go back to the seats that paid them.
+
+
+def award_pots(contributions, values, dealer, extra=0):
+    # contributions: chips each seat put in this hand
+    # values: comparable hand strength per seat, -1 for folded seats
+    # extra: chips in the pot not booked to any seat; they join the main pot
+    # Returns the chips won (or got back) by each seat. Odd chips of a split
+    # go one at a time to the tied winners closest to the dealer's left.
+    num_players = len(contributions)
+    order = sorted(range(num_players), key=contributions.__getitem__)
+    payouts = [0] * num_players
+    best = -1
+    winners = []
+    i = num_players - 1
+    while i >= 0:
+        # Every seat tied at this contribution joins the contest before its level is paid
+        level = contributions[order[i]]
+        j = i
+        while j >= 0 and contributions[order[j]] == level:
+            seat = order[j]
+            value = values[seat]
+            if value > best:
+                best = value
+                winners = [seat]
+            elif value == best and value >= 0:
+                winners.append(seat)
+            j -= 1
+        below = contributions[order[j]] if j >= 0 else 0
+        if not winners:
+            # Uncalled: every seat that paid into this level gets its slice back
+            for k in range(j + 1, num_players):
+                payouts[order[k]] += level - below
+            i = j
+            continue
+        amount = (level - below) * (num_players - 1 - j)
+        if j < 0:  # The main pot
+            amount += extra
+        i = j
+        if not amount:
+            continue
+        share, odd = divmod(amount, len(winners))
+        for winner in winners:
+            payouts[winner] += share
+        if odd:
+            for winner in sorted(winners, key=lambda s: (s - dealer - 1) % num_players)[:odd]:
+                payouts[winner] += 1
+    return payouts
@@ -0,0 +1,58 @@
+import mmap
+import os
+import struct
+
+# Pre-flop equity for every starting-hand class against 1-9 random opponents.
+# The table is generated by build_preflop_table.py and memory-mapped on import.
+TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'preflop_equity.bin')
+MAGIC = b'PFEQ'
+HEADER = struct.Struct('<4sHH')  # magic, number of hand classes, max opponents
+ENTRY = struct.Struct('<f')
+RANKS = 'AKQJT98765432'
+NUM_CLASSES = 169
+MAX_OPPONENTS = 9
+
+
+def hand_class(hole_cards):
+    # Index into the 13x13 starting-hand grid: pairs on the diagonal,
+    # suited hands above it and offsuit hands below it
+    high = 12 - (hole_cards[0] >> 2)
+    low = 12 - (hole_cards[1] >> 2)
+    if high > low:
+        high, low = low, high
+    if hole_cards[0] & 3 == hole_cards[1] & 3:
+        return high * 13 + low
+    return low * 13 + high
+
+
+def class_name(index):
+    row, col = divmod(index, 13)
+    if row == col:
+        return RANKS[row] * 2
+    if row < col:
+        return RANKS[row] + RANKS[col] + 's'
+    return RANKS[col] + RANKS[row] + 'o'
+
+
+def load_table(path=TABLE_PATH):
+    try:
+        with open(path, 'rb') as f:
+            table = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    magic, classes, opponents = HEADER.unpack_from(table, 0)
+    if (magic, classes, opponents) != (MAGIC, NUM_CLASSES, MAX_OPPONENTS):
+        table.close()
+        return None
+    return table
+
+
+_table = load_table()
+
+
+def preflop_equity(hole_cards, opponents=1):
+    # O(1) lookup; returns None when the table has not been built
+    if _table is None or not 1 <= opponents <= MAX_OPPONENTS:
+        return None
+    offset = HEADER.size + (hand_class(hole_cards) * MAX_OPPONENTS + opponents - 1) * ENTRY.size
+    return ENTRY.unpack_from(_table, offset)[0]
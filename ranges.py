@@ -0,0 +1,117 @@
+from array import array
+from itertools import combinations
+
+from board import board_info
+from cards import CARD_MASKS, evaluate_mask, hand_mask
+from equity_cache import relabel_cards, suit_relabel
+from preflop import preflop_equity
+
+# Weighted hand ranges. A range is one weight per two-card combo (1326 of
+# them, in COMBOS order). Every opponent starts on a uniform range, and each
+# voluntary call or raise multiplies the weights by how likely that action
+# is for a hand of the combo's strength on the current street, so ranges
+# drift toward the hands that play the way the opponent has played.
+
+COMBOS = list(combinations(range(52), 2))
+COMBO_COUNT = len(COMBOS)
+COMBO_MASKS = [CARD_MASKS[a] | CARD_MASKS[b] for a, b in COMBOS]
+COMBO_INDEX = {combo: i for i, combo in enumerate(COMBOS)}
+UNIFORM = array('d', [1.0] * COMBO_COUNT)
+
+# Action likelihood for a combo at strength percentile s (0 = worst, 1 = best):
+# floor + slope * s ** power. The floors keep every combo possible.
+LIKELIHOODS = {
+    'call': (0.3, 0.7, 1),
+    'raise': (0.05, 0.95, 2),
+}
+
+
+def percentiles(values):
+    # Map each value to its rank among all values, scaled to 0-1 (ties share a rank)
+    order = sorted(range(len(values)), key=values.__getitem__)
+    result = array('d', bytes(8 * len(values)))
+    scale = 1 / max(1, len(values) - 1)
+    rank = 0
+    for position, index in enumerate(order):
+        if position and values[index] != values[order[position - 1]]:
+            rank = position
+        result[index] = rank * scale
+    return result
+
+
+_preflop_strengths = None
+
+
+def preflop_strengths():
+    # Built on first use rather than on import
+    global _preflop_strengths
+    if _preflop_strengths is None:
+        equities = [preflop_equity(combo) for combo in COMBOS]
+        if equities[0] is None:
+            _preflop_strengths = array('d', [0.5] * COMBO_COUNT)  # No table: pre-flop actions carry no information
+        else:
+            _preflop_strengths = percentiles(equities)
+    return _preflop_strengths
+
+
+def board_strengths(mask):
+    values = [-1 if mask & combo else evaluate_mask(mask | combo) for combo in COMBO_MASKS]
+    return percentiles(values)
+
+
+IDENTITY = [0, 1, 2, 3]
+_permutations = {}
+
+
+def combo_permutation(relabel):
+    # Index, for each combo, of the same combo with its suits relabelled
+    key = tuple(relabel)
+    permutation = _permutations.get(key)
+    if permutation is None:
+        permutation = _permutations[key] = [COMBO_INDEX[relabel_cards(combo, relabel)] for combo in COMBOS]
+    return permutation
+
+
+def combo_strengths(board, cache=None):
+    # Strength percentile of every combo on this board. Combos that share a
+    # card with the board get 0; they are never dealt anyway. With an
+    # equity_cache.EquityCache, isomorphic boards share one table, computed
+    # on the canonical board and permuted back to this one's suits.
+    board = board_info(board)
+    if not len(board):
+        return preflop_strengths()
+    if cache is None:
+        return board_strengths(board.mask)
+    relabel = suit_relabel((), board.cards)
+    canonical = relabel_cards(board.cards, relabel)
+    table = cache.board_lookup(canonical, lambda: board_strengths(hand_mask(canonical)))
+    if relabel == IDENTITY:
+        return table  # Already the canonical board
+    return array('d', [table[i] for i in combo_permutation(relabel)])
+
+
+class Range:
+    __slots__ = ('weights', 'history')
+
+    def __init__(self):
+        self.weights = array('d', UNIFORM)
+        self.history = bytearray()  # One byte per narrowing: board size << 1 | raised
+
+    def reset(self):
+        self.weights[:] = UNIFORM
+        self.history.clear()
+
+    def narrow(self, action, strengths, board_size=0):
+        # Bayesian update on an observed 'call' or 'raise' with board_size cards out
+        likelihood = LIKELIHOODS.get(action)
+        if likelihood is None:
+            return
+        self.history.append(board_size << 1 | (action == 'raise'))
+        floor, slope, power = likelihood
+        weights = self.weights
+        for i in range(COMBO_COUNT):
+            weights[i] *= floor + slope * strengths[i] ** power
+        # Renormalise so repeated narrowing never underflows
+        scale = COMBO_COUNT / sum(weights)
+        for i in range(COMBO_COUNT):
+            weights[i] *= scale
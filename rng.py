@@ -0,0 +1,27 @@
+import random
+
+from state import shuffle_deck
+
+# Reproducible random streams. A stream is a random.Random seeded from a
+# string key such as "seed:table:hand", which Python hashes with SHA-512, so
+# every (master seed, table id, hand number) triple gets its own independent
+# stream with no shared state between tables or processes. A seeded
+# TexasHoldemGame shuffles hand n from the "deal" stream for n, samples the
+# equity it only displays from the "display" stream, and makes every other
+# draw in the hand (decisions, equity sampling) from the plain stream.
+
+
+def stream(seed, *key):
+    return random.Random(':'.join(str(part) for part in (seed,) + key))
+
+
+def deal_deck(seed, table_id, hand_number):
+    # The deck order a seeded table plays on hand `hand_number`
+    deck = bytearray(range(52))
+    shuffle_deck(deck, stream(seed, table_id, hand_number, 'deal'))
+    return deck
+
+
+def deal_batch(seed, table_id, first_hand, count):
+    # Pre-generate a run of decks, e.g. to feed play_hand(deck=...) in bulk
+    return [deal_deck(seed, table_id, hand) for hand in range(first_hand, first_hand + count)]
@@ -0,0 +1,213 @@
+import argparse
+import asyncio
+import multiprocessing
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+from equity import range_tally
+from equity_cache import range_key
+from main import TexasHoldemGame
+
+# Asyncio host for many practice tables in one process:
+#   python server.py --port 8765 --bot-tables 100
+# Every TCP connection opens a table with the client in seat 0. The protocol
+# is plain lines: the server streams the table output and prompts with
+# "Your action", the client answers "fold", "call", "check" or "raise N",
+# and "quit" (or closing the socket) folds out and ends the table after the
+# current hand. Try it with `nc localhost 8765`.
+#
+# Tables drive TexasHoldemGame.hand_steps() and answer its decision requests
+# asynchronously: human seats await their socket, bots sleep with
+# asyncio.sleep and run range equity in a process pool shared by every
+# table, so the event loop only does the bookkeeping.
+
+
+def bot_equity(hole_cards, board, ranges, thresholds, seed, total, samples):
+    # Runs in a worker process; mirrors TexasHoldemGame.estimate_hand_strength,
+    # extending the cached tally it is handed. The seed comes from the table's
+    # own stream, so seeded tables replay exactly.
+    return range_tally(hole_cards, board, ranges, thresholds, rng=random.Random(seed), total=total, samples=samples)
+
+
+class StreamOutput:
+    # Output sink that sends each line to a connected client
+    enabled = True
+
+    def __init__(self, writer):
+        self.writer = writer
+
+    def write(self, *parts):
+        if not self.writer.is_closing():
+            self.writer.write((' '.join(str(part) for part in parts) + '\n').encode())
+
+
+class Table:
+    def __init__(self, table_id, manager, writer=None):
+        self.id = table_id
+        self.manager = manager
+        self.writer = writer
+        self.lines = asyncio.Queue()  # Lines typed by the human seat
+        self.closed = False
+        self.hands = 0
+        if writer is None:
+            self.game = TexasHoldemGame(manager.num_bots, manager.starting_chips, manager.small_blind,
+                                        headless=True, equity_cache=manager.equity_cache,
+                                        seed=manager.seed, table_id=table_id)
+        else:
+            self.game = TexasHoldemGame(manager.num_bots, manager.starting_chips, manager.small_blind,
+                                        output=StreamOutput(writer), sleep=lambda seconds: None,
+                                        equity_cache=manager.equity_cache, seed=manager.seed, table_id=table_id)
+        self.task = None
+
+    async def run(self):
+        game = self.game
+        max_hands = self.manager.max_hands
+        try:
+            while not self.closed and (max_hands is None or self.hands < max_hands):
+                steps = game.hand_steps()
+                try:
+                    request = next(steps)
+                    while True:
+                        request = steps.send(await self.decide(*request))
+                except StopIteration:
+                    pass
+                self.hands += 1
+                self.manager.hands += 1
+                # Practice tables: busted seats buy back in
+                for seat in range(game.num_players):
+                    if not game.chips[seat]:
+                        game.chips[seat] = game.starting_chips
+                await asyncio.sleep(0)  # Let other tables run between hands
+        finally:
+            if self.writer is not None:
+                self.writer.close()
+            self.manager.tables.pop(self.id, None)
+
+    async def decide(self, player_index, current_bet, to_call, round_name):
+        game = self.game
+        if player_index == 0 and game.interactive:
+            game.output.write('Your action (fold/call/raise N):')
+            line = await self.lines.get()
+            if line is None:
+                return 'fold', 0  # Client left
+            words = line.split() or ['']
+            amount = None
+            if words[0].lower() == 'raise' and len(words) > 1:
+                try:
+                    amount = int(words[1])
+                except ValueError:
+                    pass
+            return words[0], amount
+
+        await asyncio.sleep(self.manager.think_time)
+        strength = game.table_strength(player_index) if game.players_in_hand[player_index] else None
+        if self.manager.pool is not None and strength is None and game.players_in_hand[player_index]:
+            # EquityCache.range_lookup split around the await
+            thresholds = game.bot_thresholds(player_index, to_call, round_name)
+            key = range_key(game.state.hand(player_index), game.community_cards,
+                            game.opponent_histories(player_index))
+            tally = game.equity_cache.get_tally(key)
+            extended = await asyncio.get_running_loop().run_in_executor(
+                self.manager.pool, bot_equity, bytes(game.state.hand(player_index)),
+                bytes(game.community_cards), game.opponent_ranges(player_index), thresholds,
+                game.rng.getrandbits(64), *(tally or (0.0, 0)))
+            if tally is None or extended[1] > tally[1]:
+                game.equity_cache.put_tally(key, extended)
+            strength = extended[0] / extended[1]
+        return game.get_bot_action(player_index, current_bet, to_call, round_name, strength)
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self.lines.put_nowait(None)
+
+
+class TableManager:
+    def __init__(self, num_bots=4, starting_chips=10000, small_blind=50, think_time=1.0,
+                 workers=None, max_hands=None, seed=None, equity_store=None):
+        self.num_bots = num_bots
+        self.seed = seed  # Master seed; table n plays the streams for (seed, n, hand)
+        self.starting_chips = starting_chips
+        self.small_blind = small_blind
+        self.think_time = think_time
+        self.max_hands = max_hands
+        # workers=0 keeps equity in the event loop (fine for tiny loads and debugging).
+        # Workers are spawned, not forked: the pool starts them lazily, and a
+        # forked worker would inherit open client sockets and hold them open.
+        self.pool = (ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn'))
+                     if workers != 0 else None)
+        # With a store path every table shares one on-disk cache that outlives restarts
+        self.equity_cache = None
+        if equity_store:
+            from equity_store import PersistentEquityCache  # sqlite3 only when asked for
+            self.equity_cache = PersistentEquityCache(equity_store)
+        self.tables = {}
+        self.next_id = 0
+        self.hands = 0
+
+    def open_table(self, writer=None):
+        table = Table(self.next_id, self, writer)
+        self.next_id += 1
+        self.tables[table.id] = table
+        table.task = asyncio.get_running_loop().create_task(table.run())
+        return table
+
+    async def handle_client(self, reader, writer):
+        table = self.open_table(writer)
+        writer.write(f'Table {table.id}: you are Player 0\n'.encode())
+        try:
+            while not table.closed:
+                line = await reader.readline()
+                if not line:
+                    break
+                line = line.decode(errors='replace').strip()
+                if line.lower() == 'quit':
+                    break
+                table.lines.put_nowait(line)
+        except ConnectionError:
+            pass
+        finally:
+            table.close()
+
+    async def serve(self, host='127.0.0.1', port=8765, bot_tables=0):
+        for _ in range(bot_tables):
+            self.open_table()
+        server = await asyncio.start_server(self.handle_client, host, port)
+        async with server:
+            await server.serve_forever()
+
+    def close(self):
+        for table in list(self.tables.values()):
+            table.close()
+            table.task.cancel()
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+        if self.equity_cache is not None:
+            self.equity_cache.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Host concurrent hold\'em tables over TCP')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--bots', type=int, default=4, help='bots per table')
+    parser.add_argument('--bot-tables', type=int, default=0, help='bot-only tables to run alongside')
+    parser.add_argument('--think-time', type=float, default=1.0, help='seconds a bot takes per decision')
+    parser.add_argument('--workers', type=int, default=None, help='equity worker processes (0 = in-loop)')
+    parser.add_argument('--max-hands', type=int, default=None, help='hands per table before it closes')
+    parser.add_argument('--seed', type=int, default=None, help='master seed for reproducible tables')
+    parser.add_argument('--equity-store', metavar='PATH', help='SQLite equity store shared by every table')
+    args = parser.parse_args()
+
+    manager = TableManager(args.bots, think_time=args.think_time, workers=args.workers,
+                           max_hands=args.max_hands, seed=args.seed, equity_store=args.equity_store)
+    try:
+        asyncio.run(manager.serve(args.host, args.port, args.bot_tables))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        manager.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,213 @@
+import argparse
+import json
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+from equity_store import PersistentEquityCache
+from history import HandHistoryWriter, TableRecorder
+from lockstep import play_lockstep
+from instrument import Metrics
+from main import TexasHoldemGame
+
+# Bot-only simulation runner. Hands are split into fixed-size shards and each
+# shard runs on a fresh headless table in a worker process with its own RNG
+# stream, so results depend only on (seed, hands, shard size), never on the
+# number of workers. The exception is --equity-store: bots carry on from the
+# range-equity tallies already in the store, which other shards (and earlier
+# runs) fill in whatever order they get there, so decisions follow the store's
+# contents. Use it for throughput, not for reproducible comparisons.
+
+
+class StatsCollector:
+    # Per-seat chip deltas, hands won and VPIP/PFR counts
+    def __init__(self, num_players):
+        self.hands = 0
+        self.chips_before = []
+        self.chip_delta = [0] * num_players
+        self.wins = [0] * num_players
+        self.vpip = [0] * num_players
+        self.pfr = [0] * num_players
+        self.voluntary = set()
+        self.raised = set()
+
+    def on_hand_start(self, game):
+        self.chips_before = list(game.chips)
+
+    def on_action(self, game, seat, street, action, amount):
+        if street != 'pre-flop':
+            return
+        if action == 'raise':
+            self.voluntary.add(seat)
+            self.raised.add(seat)
+        elif action == 'call' and amount > 0:
+            self.voluntary.add(seat)
+
+    def on_hand_end(self, game):
+        self.hands += 1
+        for seat, (before, after) in enumerate(zip(self.chips_before, game.chips)):
+            self.chip_delta[seat] += after - before
+            if after > before:
+                self.wins[seat] += 1
+        for seat in self.voluntary:
+            self.vpip[seat] += 1
+        for seat in self.raised:
+            self.pfr[seat] += 1
+        self.voluntary.clear()
+        self.raised.clear()
+
+    def to_dict(self):
+        return {
+            'hands': self.hands,
+            'chip_delta': self.chip_delta,
+            'wins': self.wins,
+            'vpip': self.vpip,
+            'pfr': self.pfr,
+        }
+
+
+def shard_seed(seed, shard):
+    # Independent, reproducible stream per shard (str seeds hash via SHA-512)
+    return random.Random(f'{seed}:{shard}').getrandbits(64)
+
+
+def run_shard(seed, shard, hands, num_bots, starting_chips, small_blind, personalities, history=None,
+              profile=False, tables=1, equity_store=None):
+    random.seed(shard_seed(seed, shard))  # Only holdem_calc still draws from the global random
+    metrics = Metrics() if profile else None
+    cache = PersistentEquityCache(equity_store) if equity_store else None  # Shared by the shard's tables
+    writer = HandHistoryWriter(f'{history}.{shard}.hh') if history else None
+    games = []
+    for table_id in range(tables):
+        # Each table plays its own (shard seed, table, hand) streams; see rng.py
+        game = TexasHoldemGame(num_bots=num_bots, starting_chips=starting_chips, small_blind=small_blind,
+                               headless=True, metrics=metrics, equity_cache=cache,
+                               seed=shard_seed(seed, shard), table_id=table_id)
+        game.personalities = list(personalities)
+        game.observers.append(StatsCollector(game.num_players))
+        if writer:
+            game.observers.append(writer if tables == 1 else TableRecorder(writer))
+        games.append(game)
+
+    def reset_stacks(game):
+        # Every hand starts from full stacks so deltas are independent samples
+        for seat in range(game.num_players):
+            game.chips[seat] = starting_chips
+
+    if tables == 1:
+        for _ in range(hands):
+            reset_stacks(game)
+            game.play_hand()
+    else:
+        play_lockstep(games, hands, before_hand=reset_stacks)
+    if writer:
+        writer.close()
+    if cache:
+        cache.close()
+    result = merge([game.observers[0].to_dict() for game in games])
+    if metrics:
+        result['metrics'] = metrics.to_dict()
+    return result
+
+
+def merge(results):
+    total = None
+    for result in results:
+        result = dict(result)
+        result.pop('metrics', None)
+        if total is None:
+            total = {key: (list(value) if isinstance(value, list) else value) for key, value in result.items()}
+            continue
+        total['hands'] += result['hands']
+        for key in ('chip_delta', 'wins', 'vpip', 'pfr'):
+            total[key] = [a + b for a, b in zip(total[key], result[key])]
+    return total
+
+
+def summarize(total, big_blind, personalities):
+    hands = total['hands'] or 1
+    seats = []
+    for seat in range(len(total['chip_delta'])):
+        seats.append({
+            'seat': seat,
+            'personality': personalities[seat],
+            'chip_delta': total['chip_delta'][seat],
+            'bb_per_100': total['chip_delta'][seat] / big_blind / hands * 100,
+            'win_rate': total['wins'][seat] / hands,
+            'vpip': total['vpip'][seat] / hands,
+            'pfr': total['pfr'][seat] / hands,
+        })
+    return {'hands': total['hands'], 'seats': seats}
+
+
+def simulate(hands, num_bots=4, workers=None, seed=0, shard_size=1000,
+             starting_chips=10000, small_blind=50, personalities=None, history=None, profile=False,
+             tables=1, equity_store=None):
+    if personalities is None:
+        # One draw per run so a seat keeps the same personality in every shard
+        rng = random.Random(seed)
+        personalities = [rng.uniform(-0.2, 0.2) for _ in range(num_bots + 1)]
+    shards = []
+    remaining = hands
+    while remaining > 0:
+        shards.append(min(shard_size, remaining))
+        remaining -= shards[-1]
+    args = [(seed, shard, count, num_bots, starting_chips, small_blind, personalities, history, profile,
+             tables, equity_store)
+            for shard, count in enumerate(shards)]
+    if workers == 1:
+        results = [run_shard(*arg) for arg in args]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(run_shard, *zip(*args)))
+    summary = summarize(merge(results), small_blind * 2, personalities)
+    if profile:
+        metrics = Metrics()
+        for result in results:
+            metrics.merge(result['metrics'])
+        summary['metrics'] = metrics
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run bot-only hands across worker processes')
+    parser.add_argument('--hands', type=int, default=10000)
+    parser.add_argument('--bots', type=int, default=4, help='bots besides seat 0 (which is also a bot)')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--shard-size', type=int, default=1000)
+    parser.add_argument('--personalities', type=float, nargs='+',
+                        help='personality modifier per seat (default: drawn from the seed)')
+    parser.add_argument('--history', metavar='PREFIX',
+                        help='write each shard\'s hand history to PREFIX.<shard>.hh')
+    parser.add_argument('--profile', action='store_true', help='collect per-phase timings (see instrument.py)')
+    parser.add_argument('--tables', type=int, default=1,
+                        help='tables per shard, stepped in lockstep with batched bot decisions')
+    parser.add_argument('--equity-store', metavar='PATH',
+                        help='SQLite equity store shared by every worker (see equity_store.py); '
+                             'results then depend on what it already holds')
+    parser.add_argument('--json', action='store_true', help='print the summary as JSON')
+    args = parser.parse_args()
+
+    if args.personalities and len(args.personalities) != args.bots + 1:
+        parser.error(f'--personalities needs {args.bots + 1} values')
+    summary = simulate(args.hands, args.bots, args.workers, args.seed, args.shard_size,
+                       personalities=args.personalities, history=args.history, profile=args.profile,
+                       tables=args.tables, equity_store=args.equity_store)
+    metrics = summary.pop('metrics', None)
+    if args.json:
+        if metrics:
+            summary['metrics'] = metrics.to_dict()
+        print(json.dumps(summary, indent=2))
+        return
+    print(f"{summary['hands']} hands")
+    print(f"{'seat':>4} {'persona':>8} {'chip delta':>12} {'bb/100':>9} {'win %':>7} {'vpip %':>7} {'pfr %':>7}")
+    for seat in summary['seats']:
+        print(f"{seat['seat']:>4} {seat['personality']:>+8.3f} {seat['chip_delta']:>12} {seat['bb_per_100']:>9.2f} "
+              f"{seat['win_rate']:>7.1%} {seat['vpip']:>7.1%} {seat['pfr']:>7.1%}")
+    if metrics:
+        print()
+        print(metrics.report())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+import random
+from array import array
+
+# Fixed-size, allocation-free game state. Stacks, bets (this street) and
+# contributions (this hand, for side pots) are int64 arrays; fold flags, hole
+# cards, board and deck are bytearrays of card ints (see cards.py). One deck
+# buffer is reshuffled in place every hand, and a snapshot is a handful of
+# bytes copies, so search code can branch and rewind cheaply.
+
+
+class GameState:
+    __slots__ = ('num_players', 'chips', 'bets', 'contributed', 'in_hand', 'holes', 'board', 'board_size',
+                 'deck', 'deck_pos', 'pot', 'dealer')
+
+    def __init__(self, num_players, starting_chips=0):
+        self.num_players = num_players
+        self.chips = array('q', [starting_chips] * num_players)
+        self.bets = array('q', [0] * num_players)
+        self.contributed = array('q', [0] * num_players)
+        self.in_hand = bytearray(b'\x01' * num_players)
+        self.holes = bytearray(2 * num_players)
+        self.board = bytearray(5)
+        self.board_size = 0
+        self.deck = bytearray(range(52))
+        self.deck_pos = 0
+        self.pot = 0
+        self.dealer = 0
+
+    def new_hand(self, rng=random, deck=None):
+        # Reset per-hand fields in place and reshuffle the deck buffer
+        self.pot = 0
+        self.board_size = 0
+        self.deck_pos = 0
+        self.clear_bets()
+        contributed = self.contributed
+        for seat in range(self.num_players):
+            contributed[seat] = 0
+        self.in_hand[:] = b'\x01' * self.num_players
+        if deck is not None:
+            self.deck[:] = bytes(deck)
+            return
+        shuffle_deck(self.deck, rng)
+
+    def clear_bets(self):
+        bets = self.bets
+        for seat in range(self.num_players):
+            bets[seat] = 0
+
+    def draw(self):
+        card = self.deck[self.deck_pos]
+        self.deck_pos += 1
+        return card
+
+    def deal_hole_cards(self):
+        for seat in range(self.num_players):
+            self.holes[2 * seat] = self.draw()
+            self.holes[2 * seat + 1] = self.draw()
+
+    def deal_board(self, num_cards):
+        for _ in range(num_cards):
+            self.board[self.board_size] = self.draw()
+            self.board_size += 1
+
+    def hand(self, seat):
+        return self.holes[2 * seat:2 * seat + 2]
+
+    def community_cards(self):
+        return self.board[:self.board_size]
+
+    def snapshot(self):
+        return (bytes(self.chips), bytes(self.bets), bytes(self.contributed), bytes(self.in_hand), bytes(self.holes),
+                bytes(self.board), self.board_size, bytes(self.deck), self.deck_pos,
+                self.pot, self.dealer)
+
+    def restore(self, snapshot):
+        # Copy back into the existing buffers; nothing is reallocated
+        chips, bets, contributed, in_hand, holes, board, self.board_size, deck, self.deck_pos, self.pot, self.dealer = snapshot
+        memoryview(self.chips).cast('B')[:] = chips
+        memoryview(self.bets).cast('B')[:] = bets
+        memoryview(self.contributed).cast('B')[:] = contributed
+        self.in_hand[:] = in_hand
+        self.holes[:] = holes
+        self.board[:] = board
+        self.deck[:] = deck
+
+
+def shuffle_deck(deck, rng=random):
+    # In-place Fisher-Yates over a deck buffer
+    for i in range(len(deck) - 1, 0, -1):
+        j = int(rng.random() * (i + 1))
+        deck[i], deck[j] = deck[j], deck[i]
@@ -0,0 +1,89 @@
+import random
+import unittest
+from collections import Counter
+from itertools import combinations
+
+from cards import HAND_NAMES, cards_from_str, evaluate, hand_category, hand_ranks
+
+
+def best_five(cards):
+    # Reference evaluator: score all 21 five-card hands the slow, obvious way
+    return max(score_five(hand) for hand in combinations(cards, 5))
+
+
+def score_five(cards):
+    ranks = sorted(((card >> 2) + 2 for card in cards), reverse=True)
+    flush = len({card & 3 for card in cards}) == 1
+    straight_high = 0
+    if len(set(ranks)) == 5:
+        if ranks[0] - ranks[4] == 4:
+            straight_high = ranks[0]
+        elif ranks == [14, 5, 4, 3, 2]:
+            straight_high = 5  # The wheel
+    groups = sorted(Counter(ranks).items(), key=lambda item: (item[1], item[0]), reverse=True)
+    counts = [count for _, count in groups]
+    grouped = [rank for rank, _ in groups]
+    if straight_high and flush:
+        return 8, [straight_high]
+    if counts[0] == 4:
+        return 7, grouped
+    if counts[:2] == [3, 2]:
+        return 6, grouped
+    if flush:
+        return 5, ranks
+    if straight_high:
+        return 4, [straight_high]
+    if counts[0] == 3:
+        return 3, grouped
+    if counts[:2] == [2, 2]:
+        return 2, grouped
+    if counts[0] == 2:
+        return 1, grouped
+    return 0, ranks
+
+
+class EvaluateTest(unittest.TestCase):
+    def test_matches_brute_force(self):
+        rng = random.Random(3)
+        deck = list(range(52))
+        previous = None
+        for _ in range(5000):
+            cards = rng.sample(deck, rng.choice((5, 6, 7)))
+            value = evaluate(cards)
+            expected = best_five(cards)
+            self.assertEqual((hand_category(value), hand_ranks(value)), expected, cards)
+            if previous is not None:
+                # Values order hands exactly as the reference does
+                self.assertEqual((value > previous[0]) - (value < previous[0]),
+                                 (expected > previous[1]) - (expected < previous[1]), cards)
+            previous = value, expected
+
+    def test_wheel(self):
+        value = evaluate(cards_from_str(['Ah', '2c', '3d', '4s', '5h', '9c', 'Kd']))
+        self.assertEqual(HAND_NAMES[hand_category(value)], 'Straight')
+        self.assertEqual(hand_ranks(value), [5])
+        self.assertLess(value, evaluate(cards_from_str(['2c', '3d', '4s', '5h', '6h', '9c', 'Kd'])))
+
+    def test_steel_wheel(self):
+        value = evaluate(cards_from_str(['Ah', '2h', '3h', '4h', '5h', 'Kh', 'Kd']))
+        self.assertEqual(HAND_NAMES[hand_category(value)], 'Straight Flush')
+        self.assertEqual(hand_ranks(value), [5])
+
+    def test_double_trips_make_the_best_full_house(self):
+        value = evaluate(cards_from_str(['Kh', 'Kd', 'Kc', '9s', '9h', '9d', '2c']))
+        self.assertEqual(HAND_NAMES[hand_category(value)], 'Full House')
+        self.assertEqual(hand_ranks(value), [13, 9])
+
+    def test_three_pair_plays_the_top_two(self):
+        value = evaluate(cards_from_str(['Ah', 'Ad', 'Kc', 'Ks', '2h', '2d', '7c']))
+        self.assertEqual(HAND_NAMES[hand_category(value)], 'Two Pair')
+        self.assertEqual(hand_ranks(value), [14, 13, 7])
+
+    def test_flush_beats_straight_in_the_same_hand(self):
+        value = evaluate(cards_from_str(['6h', '7h', '8c', '9h', 'Th', '2h', 'Kd']))
+        self.assertEqual(HAND_NAMES[hand_category(value)], 'Flush')
+        self.assertEqual(hand_ranks(value), [10, 9, 7, 6, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,28 @@
+import os
+import tempfile
+import unittest
+
+from history import HandHistoryWriter, HandRecorder, read_hands, replay
+from main import TexasHoldemGame
+
+
+class HandHistoryTest(unittest.TestCase):
+    def test_round_trip_and_replay(self):
+        game = TexasHoldemGame(num_bots=3, headless=True, seed=5)
+        recorded = []
+        recorder = HandRecorder()
+        recorder.handle = recorded.append
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'hands.hh')
+            with HandHistoryWriter(path, flush_bytes=256) as writer:
+                game.observers += [recorder, writer]
+                for _ in range(20):
+                    game.play_hand()
+            hands = list(read_hands(path))
+        self.assertEqual(hands, recorded)
+        for hand in hands:
+            self.assertEqual(replay(hand), hand)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,25 @@
+import unittest
+
+from pots import award_pots
+
+
+class AwardPotsTest(unittest.TestCase):
+    def test_folded_overbet_comes_back(self):
+        # Nobody matched the folded seat's last 300, so it goes back; the winners split the rest
+        self.assertEqual(award_pots([200, 200, 500], [4, 4, -1], 0), [300, 300, 300])
+
+    def test_survivor_wins_only_what_it_matched(self):
+        # Everyone else folded to a seat that put nothing in
+        self.assertEqual(award_pots([1562, 1562, 1562, 0], [-1, -1, -1, 0], 2), [1562, 1562, 1562, 0])
+        self.assertEqual(award_pots([300, 300, 100, 100], [-1, -1, 0, -1], 0, extra=5), [200, 200, 405, 0])
+
+    def test_short_all_in_wins_only_the_main_pot(self):
+        self.assertEqual(award_pots([100, 500, 500], [9, 5, 3], 0), [300, 800, 0])
+
+    def test_odd_chip_goes_left_of_the_dealer(self):
+        self.assertEqual(award_pots([100, 100, 100], [5, 5, -1], 0, extra=1), [150, 151, 0])
+        self.assertEqual(award_pots([100, 100, 100], [5, 5, -1], 1, extra=1), [151, 150, 0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+from cards import CARD_MASKS, CATEGORY_SHIFT, POPCOUNT, STRAIGHT_WINDOWS, evaluate_mask
+
+# Per-seat hand state that is updated card by card instead of rebuilt from
+# the hole and board cards. deal_hole_cards resets it, and each board card is
+# folded into every seat's mask, suit counts and rank set with a few bit
+# operations, so draw information is a lookup. Hand values are evaluated only
+# when read, at most once per seat per street.
+
+
+class HandTracker:
+    __slots__ = ('num_players', 'masks', 'values', 'suit_counts', 'rank_sets', 'board_size')
+
+    def __init__(self, num_players):
+        self.num_players = num_players
+        self.masks = [0] * num_players
+        self.values = [None] * num_players  # Cached value(), None until read
+        self.suit_counts = bytearray(4 * num_players)
+        self.rank_sets = [0] * num_players  # 13-bit set of ranks held
+        self.board_size = 0
+
+    def reset(self, holes):
+        # Start a hand from the dealt hole cards (2 bytes per seat, as in GameState)
+        self.board_size = 0
+        self.values = [None] * self.num_players
+        self.suit_counts[:] = bytes(len(self.suit_counts))
+        for seat in range(self.num_players):
+            self.masks[seat] = 0
+            self.rank_sets[seat] = 0
+            self._add(seat, holes[2 * seat])
+            self._add(seat, holes[2 * seat + 1])
+
+    def sync(self, holes, board):
+        # Rebuild from scratch, e.g. after GameState.restore
+        self.reset(holes)
+        for card in board:
+            self.add(card)
+
+    def add(self, card):
+        # A board card: shared by every seat
+        self.board_size += 1
+        self.values = [None] * self.num_players
+        for seat in range(self.num_players):
+            self._add(seat, card)
+
+    def _add(self, seat, card):
+        self.masks[seat] |= CARD_MASKS[card]
+        self.suit_counts[4 * seat + (card & 3)] += 1
+        self.rank_sets[seat] |= 1 << (card >> 2)
+
+    def value(self, seat):
+        # cards.evaluate value of the seat's cards so far
+        value = self.values[seat]
+        if value is None:
+            value = self.values[seat] = evaluate_mask(self.masks[seat])
+        return value
+
+    def category(self, seat):
+        return self.value(seat) >> CATEGORY_SHIFT
+
+    def flush_draw(self, seat):
+        # Four to a flush with at least one card to come
+        return self.board_size < 5 and max(self.suit_counts[4 * seat:4 * seat + 4]) == 4
+
+    def straight_draw(self, seat):
+        # Number of distinct ranks that would complete a straight (2 = open-ended)
+        if self.board_size >= 5:
+            return 0
+        ranks = self.rank_sets[seat]
+        needed = 0
+        for window in STRAIGHT_WINDOWS:
+            if ranks & window == window:
+                return 0  # Already made
+            if POPCOUNT[ranks & window] == 4:
+                needed |= window & ~ranks
+        return POPCOUNT[needed]
+
+    def outs(self, seat):
+        # Unseen cards (from this seat's view) that would improve its hand category
+        if not 3 <= self.board_size < 5:
+            return []
+        mask = self.masks[seat]
+        category = self.category(seat)
+        return [card for card in range(52)
+                if not mask & CARD_MASKS[card]
+                and evaluate_mask(mask | CARD_MASKS[card]) >> CATEGORY_SHIFT > category]